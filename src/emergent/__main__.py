@@ -57,6 +57,7 @@ async def _run() -> None:
         make_memory_store_handler,
     )
     from emergent.tools.registry import SafetyTier, ToolDefinition
+    from emergent.tools.web import close_client as close_web_client
 
     store = MemoryStore(db_path)
     retriever = SemanticRetriever(chroma_dir)
@@ -235,6 +236,7 @@ async def _run() -> None:
             await gateway.stop()
         if scheduler.running:
             scheduler.shutdown(wait=False)
+        await close_web_client()
         await store.close()
         log.info("emergent_stopped")
 
@@ -23,6 +23,7 @@ _BUDGET = {
 }
 
 _TOTAL_CONTEXT_BUDGET = 20_000  # tokens
+_MIN_HISTORY_TURNS = 4  # kept even over budget, so the model never loses the recent exchange
 _CHARS_PER_TOKEN = 4
 
 
@@ -70,12 +71,22 @@ class ContextBuilder:
         Returns:
             (user_profile_text, semantic_memories, session_summary, history_messages)
         """
-        # Fetch all in parallel with graceful degradation
+        fixed_tokens = _BUDGET["system_prompt"] + _BUDGET["response_buffer"]
+        available = self._context_budget - fixed_tokens
+
+        # Fetch all in parallel with graceful degradation. History can never use more
+        # than the whole dynamic budget, so older turns past it are not even loaded
+        # (the last _MIN_HISTORY_TURNS always are, as in the cascade below)
         results = await asyncio.gather(
             self._store.get_profile_as_text(min_confidence=0.5),
             self._retriever.get_relevant_memories_as_text(current_query, top_k=3),
             self._store.get_session_summary(session_id),
-            self._store.get_recent_history(session_id, max_turns=max_history_turns),
+            self._store.get_recent_history(
+                session_id,
+                max_turns=max_history_turns,
+                max_tokens=available,
+                min_turns=_MIN_HISTORY_TURNS,
+            ),
             return_exceptions=True,
         )
 
@@ -105,9 +116,6 @@ class ContextBuilder:
             logger.warning("history_fetch_failed", error=str(results[3]))
 
         # Apply token budget constraints
-        fixed_tokens = _BUDGET["system_prompt"] + _BUDGET["response_buffer"]
-        available = self._context_budget - fixed_tokens
-
         profile_tokens = _estimate_tokens(profile_text) if profile_text else 0
         memories_tokens = sum(_estimate_tokens(m) for m in (memories or []))
         summary_tokens = _estimate_tokens(summary) if summary else 0
@@ -136,7 +144,7 @@ class ContextBuilder:
                 total_used -= summary_tokens
 
             # 4. Truncate history
-            while history and total_used > available and len(history) > 4:
+            while history and total_used > available and len(history) > _MIN_HISTORY_TURNS:
                 removed = history.pop(0)
                 total_used -= _estimate_tokens(removed.get("content", ""))
                 logger.warning("context_budget_truncate_history", remaining=len(history))
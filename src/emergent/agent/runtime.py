@@ -20,18 +20,22 @@ Guards (hardcoded, NOT configurable by the agent):
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import random
 import time
 import uuid
-from collections.abc import Awaitable, Callable
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
 import anthropic
 import structlog
 from tenacity import (
+    RetryCallState,
     retry,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
-    wait_exponential,
 )
 
 from emergent import (
@@ -43,7 +47,7 @@ from emergent.agent.prompts import DEFAULT_SYSTEM_PROMPT, build_system_prompt
 from emergent.config import EmergentSettings
 
 if TYPE_CHECKING:
-    from emergent.tools.registry import ToolRegistry
+    from emergent.tools.registry import SafetyTier, ToolRegistry
 
 logger = structlog.get_logger(__name__)
 
@@ -64,6 +68,117 @@ def _calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     ) / 1_000_000
 
 
+_RETRY_BASE_DELAY = 1.0  # seconds
+_RETRY_MAX_DELAY = 30.0
+
+
+def _retry_after(error: anthropic.APIStatusError) -> float | None:
+    """Seconds the API asked us to wait, from the retry-after header, capped at 30s."""
+    value = error.response.headers.get("retry-after")
+    try:
+        delay = float(value) if value is not None else None
+    except ValueError:
+        return None
+    # A server-supplied hour would otherwise park the agent (and the shared gate) for an hour
+    return None if delay is None else min(delay, _RETRY_MAX_DELAY)
+
+
+def _is_transient(error: BaseException) -> bool:
+    """429s, 5xx and dropped/timed-out connections; other 4xx fail fast."""
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, anthropic.APIConnectionError)
+
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Honour retry-after when the API sent one, else decorrelated jitter."""
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(error, anthropic.APIStatusError) and (delay := _retry_after(error)) is not None:
+        return delay
+    # upcoming_sleep still holds the previous wait here (0.0 before the first retry)
+    previous = max(retry_state.upcoming_sleep, _RETRY_BASE_DELAY)
+    return min(_RETRY_MAX_DELAY, random.uniform(_RETRY_BASE_DELAY, previous * 3))
+
+
+class _RateGate:
+    """Sliding-window RPM/TPM budget, so bursts wait locally instead of drawing 429s."""
+
+    _WINDOW = 60.0  # seconds
+
+    def __init__(self, rpm_limit: int, tpm_limit: int) -> None:
+        self._rpm_limit = rpm_limit
+        self._tpm_limit = tpm_limit
+        self._requests: deque[float] = deque()
+        self._tokens: deque[tuple[float, int]] = deque()
+        self._token_total = 0
+        self._resume_at = 0.0  # set from a 429's retry-after
+        # Waiters queue up in order rather than all waking when the window frees one slot
+        self._lock = asyncio.Lock()
+
+    def _delay(self, now: float) -> float:
+        horizon = now - self._WINDOW
+        while self._requests and self._requests[0] <= horizon:
+            self._requests.popleft()
+        while self._tokens and self._tokens[0][0] <= horizon:
+            self._token_total -= self._tokens.popleft()[1]
+
+        delay = self._resume_at - now
+        if self._rpm_limit and len(self._requests) >= self._rpm_limit:
+            delay = max(delay, self._requests[0] - horizon)
+        if self._tpm_limit and self._token_total >= self._tpm_limit:
+            delay = max(delay, self._tokens[0][0] - horizon)
+        return delay
+
+    async def acquire(self) -> None:
+        """Wait until one more request fits the window, then count it."""
+        async with self._lock:
+            while (delay := self._delay(time.monotonic())) > 0:
+                logger.info("rate_gate_wait", delay_s=round(delay, 2))
+                await asyncio.sleep(delay)
+            self._requests.append(time.monotonic())
+
+    def record(self, tokens: int) -> None:
+        self._tokens.append((time.monotonic(), tokens))
+        self._token_total += tokens
+
+    def pause(self, seconds: float) -> None:
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+class _AimdLimiter:
+    """Cap on concurrent API calls: halved when the API throttles or overloads, +1 per success.
+
+    Under a 429/5xx storm callers settle at the concurrency the API sustains instead of
+    all retrying into it at once.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16) -> None:
+        self._limit = initial
+        self._min = minimum
+        self._max = maximum
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self) -> None:
+        self._limit = min(self._max, self._limit + 1)
+
+    def on_overload(self) -> None:
+        self._limit = max(self._min, self._limit // 2)
+        logger.warning("llm_concurrency_reduced", limit=self._limit)
+
+
 class AgentRuntime:
     """Core agentic loop using Claude's native tool_use."""
 
@@ -76,7 +191,8 @@ class AgentRuntime:
         self._settings = settings
         self._registry = registry
         self._confirm_callback = confirm_callback
-        self._client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self._gate = _RateGate(settings.agent.rpm_limit, settings.agent.tpm_limit)
+        self._limiter = _AimdLimiter()
 
         # Hardcoded guards
         self._MAX_ITERATIONS = settings.agent.MAX_ITERATIONS
@@ -85,9 +201,16 @@ class AgentRuntime:
         self._TIMEOUT_SESSION = settings.agent.TIMEOUT_SESSION_SECONDS
         self._MAX_OUTPUT_CHARS = settings.agent.MAX_TOOL_OUTPUT_CHARS
 
+    @cached_property
+    def _client(self) -> anthropic.AsyncAnthropic:
+        """API client, built on first use so runtimes that never call out skip the setup."""
+        # Retries are ours (_call_with_retry); SDK retries would multiply the attempts
+        return anthropic.AsyncAnthropic(api_key=self._settings.anthropic_api_key, max_retries=0)
+
     async def close(self) -> None:
         """Close runtime resources (HTTP client connections)."""
-        await self._client.close()
+        if "_client" in self.__dict__:
+            await self._client.close()
 
     async def run(
         self,
@@ -268,16 +391,27 @@ class AgentRuntime:
         return response_text, trace_data
 
     @retry(
-        retry=retry_if_exception_type(
-            (anthropic.RateLimitError, anthropic.InternalServerError, anthropic.APITimeoutError)
-        ),
-        wait=wait_exponential(multiplier=1, min=1, max=30),
+        retry=retry_if_exception(_is_transient),
+        wait=_retry_wait,
         stop=stop_after_attempt(3),
         reraise=True,
     )
     async def _call_with_retry(self, **kwargs: Any) -> Any:
         """Call Claude API with automatic retry on transient errors."""
-        return await self._client.messages.create(**kwargs)
+        await self._gate.acquire()
+        async with self._limiter.slot():
+            try:
+                response = await self._client.messages.create(**kwargs)
+            except anthropic.APIStatusError as e:
+                if _is_transient(e):
+                    self._limiter.on_overload()
+                # Hold every caller back for as long as the API asked, not just this one
+                if isinstance(e, anthropic.RateLimitError) and (delay := _retry_after(e)):
+                    self._gate.pause(delay)
+                raise
+            self._limiter.on_success()
+        self._gate.record(response.usage.input_tokens + response.usage.output_tokens)
+        return response
 
     async def _handle_tool_calls(
         self,
@@ -312,7 +446,7 @@ class AgentRuntime:
 
         for block in tool_use_blocks:
             tier = self._registry.classify(block.name, block.input)
-            if tier == SafetyTier.TIER_1_AUTO:
+            if tier is SafetyTier.TIER_1_AUTO:
                 tier1_blocks.append(block)
             else:
                 other_blocks.append((block, tier))
@@ -320,7 +454,10 @@ class AgentRuntime:
         # Execute TIER_1 tools in parallel
         if tier1_blocks:
             results = await asyncio.gather(
-                *[self._execute_tool(b, trace_id, log) for b in tier1_blocks],
+                *[
+                    self._execute_tool(b, trace_id, log, SafetyTier.TIER_1_AUTO)
+                    for b in tier1_blocks
+                ],
                 return_exceptions=True,
             )
             for block, result in zip(tier1_blocks, results):
@@ -346,7 +483,7 @@ class AgentRuntime:
         # Handle TIER_2 and TIER_3 sequentially
         for block, tier in other_blocks:
             tools_called.append(block.name)
-            if tier == SafetyTier.TIER_3_BLOCKED:
+            if tier is SafetyTier.TIER_3_BLOCKED:
                 log.warning(
                     "tier3_blocked",
                     tool_name=block.name,
@@ -360,7 +497,7 @@ class AgentRuntime:
                         "is_error": True,
                     }
                 )
-            elif tier == SafetyTier.TIER_2_CONFIRM:
+            elif tier is SafetyTier.TIER_2_CONFIRM:
                 result = await self._handle_tier2(block, trace_id, log, confirm_callback)
                 tool_results.append(
                     {
@@ -378,6 +515,7 @@ class AgentRuntime:
         block: Any,
         trace_id: str,
         log: Any,
+        tier: SafetyTier | None = None,
     ) -> str:
         """Execute a tool with timeout, truncating output."""
         tool_start = time.monotonic()
@@ -385,7 +523,7 @@ class AgentRuntime:
 
         try:
             result = await asyncio.wait_for(
-                self._registry.execute(block.name, block.input),  # type: ignore[union-attr]
+                self._registry.execute(block.name, block.input, tier),  # type: ignore[union-attr]
                 timeout=self._TIMEOUT_PER_TOOL,
             )
         except TimeoutError:
@@ -147,9 +147,8 @@ class TerminalChannel:
 
         # Persist conversation
         try:
-            await self._store.save_conversation_turn(SESSION_ID, "user", user_text)
-            await self._store.save_conversation_turn(
-                SESSION_ID, "assistant", response_text
+            await self._store.save_conversation_turns(
+                SESSION_ID, [("user", user_text), ("assistant", response_text)]
             )
             await self._store.save_trace(trace_data)
         except Exception as e:
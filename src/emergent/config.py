@@ -28,6 +28,9 @@ class AgentConfig:
     haiku_model: str = "claude-haiku-4-5-20251001"
     max_tokens: int = 4096
     data_dir: str = "./data"
+    # Client-side API budget per rolling minute; 0 disables that limit
+    rpm_limit: int = 50
+    tpm_limit: int = 0
 
     # Hardcoded guards — NOT overridable by the agent at runtime
     MAX_ITERATIONS: int = 15
@@ -99,6 +102,8 @@ def get_settings() -> EmergentSettings:
         haiku_model=env.EMERGENT_HAIKU_MODEL or agent_yaml.get("haiku_model", "claude-haiku-4-5-20251001"),
         max_tokens=agent_yaml.get("max_tokens", 4096),
         data_dir=env.EMERGENT_DATA_DIR or agent_yaml.get("data_dir", "./data"),
+        rpm_limit=agent_yaml.get("rpm_limit", 50),
+        tpm_limit=agent_yaml.get("tpm_limit", 0),
     )
 
     settings = EmergentSettings(
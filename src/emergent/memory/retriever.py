@@ -35,6 +35,8 @@ class SemanticRetriever:
         self._chroma_dir = str(chroma_dir)
         self._client: Any = None
         self._collection: Any = None
+        # Bumped on every write so callers can tell when cached search results are stale
+        self.generation = 0
 
     def _ensure_initialized(self) -> bool:
         """Lazy initialization of ChromaDB. Returns False if unavailable."""
@@ -92,6 +94,8 @@ class SemanticRetriever:
                 except Exception as e:
                     logger.warning("chromadb_upsert_error", error=str(e), doc_id=doc_id)
 
+        if docs_added:
+            self.generation += 1
         logger.info("chromadb_session_indexed", session_id=session_id, docs=docs_added)
         return docs_added
 
@@ -6,6 +6,9 @@ import asyncio
 import json
 import sqlite3
 import uuid
+from collections import deque
+from collections.abc import Sequence
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
@@ -13,8 +16,42 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Recent-history ring buffers for warm sessions, so building the prompt context does not
+# query SQLite every turn. Filled on a session's first read, then appended on each write.
+_HISTORY_CACHE_TURNS = 50
+_HISTORY_CACHE_SESSIONS = 64
+# Most trace rows written per executemany() by the background writer
+_TRACE_BATCH = 64
+
+_CHARS_PER_TOKEN = 4  # same rough estimate as the context builder, rounded up per turn
+
+
+def _history_messages(
+    turns: Sequence[tuple[str, str]], max_tokens: int | None, min_turns: int = 0
+) -> list[dict[str, Any]]:
+    """Turns as API messages, keeping only the newest that fit max_tokens if given.
+
+    The newest min_turns are kept even when they alone exceed the budget.
+    """
+    if max_tokens is not None:
+        floor = max(len(turns) - min_turns, 0)
+        start = len(turns)
+        budget = max_tokens
+        while start:
+            # ceil(len / 4): a short turn still costs a token, so many can't ride free
+            budget += -len(turns[start - 1][1]) // _CHARS_PER_TOKEN
+            if budget < 0 and start <= floor:
+                break
+            start -= 1
+        turns = turns[start:]
+    return [{"role": role, "content": content} for role, content in turns]
+
+
 _SCHEMA = """
 PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
 PRAGMA foreign_keys=ON;
 
 CREATE TABLE IF NOT EXISTS conversations (
@@ -87,6 +124,7 @@ CREATE TABLE IF NOT EXISTS chat_sessions (
 
 CREATE INDEX IF NOT EXISTS idx_conversations_session ON conversations(session_id);
 CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations(timestamp);
+CREATE INDEX IF NOT EXISTS idx_summaries_session ON session_summaries(session_id, generated_at);
 CREATE INDEX IF NOT EXISTS idx_traces_timestamp ON traces(timestamp);
 CREATE INDEX IF NOT EXISTS idx_spans_trace ON spans(trace_id);
 CREATE INDEX IF NOT EXISTS idx_spans_error ON spans(error) WHERE error IS NOT NULL;
@@ -101,6 +139,21 @@ class MemoryStore:
         self._db_path = str(db_path)
         self._conn: sqlite3.Connection | None = None
         self._lock = asyncio.Lock()
+        self._history: dict[str, deque[tuple[str, str]]] = {}
+        # Bumped on every conversation write; a cold read only fills the cache if no
+        # write landed while its query was in flight
+        self._history_writes = 0
+        # key → (value, confidence), mirrored from user_profile in rowid order. Loaded on
+        # first use; versioned like the history cache so a racing load is not kept
+        self._profile: dict[str, tuple[str, float]] | None = None
+        self._profile_version = 0
+        # Rendered get_profile_as_text() per min_confidence; cleared on every profile write
+        self._profile_text: dict[float, str | None] = {}
+        # Trace rows queued by save_trace() and written by one background task, so the
+        # INSERT never sits on a request's tail. Both are created on the first save_trace()
+        # since the store may be built before the event loop is running
+        self._trace_queue: asyncio.Queue[tuple[Any, ...]] | None = None
+        self._background_tasks: set[asyncio.Task[None]] = set()
 
     def _get_conn(self) -> sqlite3.Connection:
         if self._conn is None:
@@ -136,6 +189,16 @@ class MemoryStore:
 
     # --- Conversations ---
 
+    def _remember_turns(self, session_id: str, turns: list[tuple[str, str]]) -> None:
+        self._history_writes += 1
+        cached = self._history.get(session_id)
+        if cached is not None:
+            cached.extend(turns)
+
+    def _forget_history(self) -> None:
+        self._history_writes += 1
+        self._history.clear()
+
     async def save_conversation_turn(
         self,
         session_id: str,
@@ -150,18 +213,82 @@ class MemoryStore:
             "VALUES (?, ?, ?, ?, ?, ?)",
             (turn_id, session_id, role, content, tokens_used, model),
         )
+        self._remember_turns(session_id, [(role, content)])
         return turn_id
 
+    async def save_conversation_turns(
+        self, session_id: str, turns: list[tuple[str, str]]
+    ) -> list[str]:
+        """Insert (role, content) turns in order, in a single transaction."""
+        turn_ids = [str(uuid.uuid4()) for _ in turns]
+        await self._executemany(
+            "INSERT INTO conversations (id, session_id, role, content) VALUES (?, ?, ?, ?)",
+            [
+                (turn_id, session_id, role, content)
+                for turn_id, (role, content) in zip(turn_ids, turns, strict=True)
+            ],
+        )
+        self._remember_turns(session_id, turns)
+        return turn_ids
+
     async def get_recent_history(
-        self, session_id: str, max_turns: int = 20
+        self,
+        session_id: str,
+        max_turns: int = 20,
+        max_tokens: int | None = None,
+        min_turns: int = 0,
     ) -> list[dict[str, Any]]:
-        rows = await self._execute(
-            "SELECT role, content FROM conversations "
-            "WHERE session_id = ? ORDER BY rowid DESC LIMIT ?",
-            (session_id, max_turns),
-        )
-        # Return in chronological order
-        return [{"role": r["role"], "content": r["content"]} for r in reversed(rows)]
+        cacheable = 0 < max_turns <= _HISTORY_CACHE_TURNS
+        cached = self._history.get(session_id) if cacheable else None
+        if cached is None:
+            writes = self._history_writes
+            rows = await self._execute(
+                "SELECT role, content FROM conversations "
+                "WHERE session_id = ? ORDER BY rowid DESC LIMIT ?",
+                (session_id, _HISTORY_CACHE_TURNS if cacheable else max_turns),
+            )
+            # Chronological order
+            turns = [(r["role"], r["content"]) for r in reversed(rows)]
+            if not cacheable:
+                return _history_messages(turns, max_tokens, min_turns)
+            cached = deque(turns, maxlen=_HISTORY_CACHE_TURNS)
+            if writes == self._history_writes:
+                if len(self._history) >= _HISTORY_CACHE_SESSIONS:
+                    del self._history[next(iter(self._history))]
+                self._history[session_id] = cached
+        recent = list(islice(cached, max(len(cached) - max_turns, 0), None))
+        return _history_messages(recent, max_tokens, min_turns)
+
+    async def get_recent_histories(
+        self, session_ids: Sequence[str], max_turns: int = 20
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Recent history for several sessions: warm ones from cache, the rest in one query."""
+        cacheable = 0 < max_turns <= _HISTORY_CACHE_TURNS
+        histories: dict[str, list[dict[str, Any]]] = {}
+        missing: list[str] = []
+        for session_id in dict.fromkeys(session_ids):
+            cached = self._history.get(session_id) if cacheable else None
+            if cached is None:
+                missing.append(session_id)
+            else:
+                recent = list(islice(cached, max(len(cached) - max_turns, 0), None))
+                histories[session_id] = _history_messages(recent, None)
+
+        if missing:
+            placeholders = ",".join("?" * len(missing))
+            rows = await self._execute(
+                "SELECT session_id, role, content FROM ("
+                "SELECT session_id, role, content, rowid AS seq, "
+                "ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY rowid DESC) AS n "
+                f"FROM conversations WHERE session_id IN ({placeholders})"
+                ") WHERE n <= ? ORDER BY session_id, seq",
+                (*missing, max_turns),
+            )
+            for session_id in missing:
+                histories[session_id] = []
+            for r in rows:
+                histories[r["session_id"]].append({"role": r["role"], "content": r["content"]})
+        return histories
 
     async def get_all_sessions(self) -> list[str]:
         rows = await self._execute(
@@ -172,11 +299,13 @@ class MemoryStore:
     # --- Traces ---
 
     async def save_trace(self, trace_data: dict[str, Any]) -> None:
-        await self._execute(
-            "INSERT OR REPLACE INTO traces "
-            "(id, session_id, total_duration_ms, total_tokens, total_cost_usd, "
-            "iterations, tools_called_json, success, error_message) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        """Queue a trace for the background writer; returns without touching the DB."""
+        if self._trace_queue is None:
+            self._trace_queue = asyncio.Queue()
+            task = asyncio.create_task(self._drain_traces(self._trace_queue))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        self._trace_queue.put_nowait(
             (
                 trace_data.get("trace_id", str(uuid.uuid4())),
                 trace_data.get("session_id", ""),
@@ -187,39 +316,80 @@ class MemoryStore:
                 json.dumps(trace_data.get("tools_called", [])),
                 trace_data.get("success", True),
                 trace_data.get("error_message"),
-            ),
+            )
         )
 
+    async def _drain_traces(self, queue: asyncio.Queue[tuple[Any, ...]]) -> None:
+        """Write queued traces, batching whatever piled up while the last write ran."""
+        while True:
+            rows = [await queue.get()]
+            while len(rows) < _TRACE_BATCH and not queue.empty():
+                rows.append(queue.get_nowait())
+            try:
+                await self._executemany(
+                    "INSERT OR REPLACE INTO traces "
+                    "(id, session_id, total_duration_ms, total_tokens, total_cost_usd, "
+                    "iterations, tools_called_json, success, error_message) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except Exception as e:
+                logger.error("trace_write_failed", count=len(rows), error=str(e))
+            finally:
+                for _ in rows:
+                    queue.task_done()
+
+    async def flush_traces(self) -> None:
+        """Wait until every queued trace has been written."""
+        if self._trace_queue is not None:
+            await self._trace_queue.join()
+
     # --- User Profile ---
 
+    async def _profile_entries(self) -> dict[str, tuple[str, float]]:
+        if self._profile is not None:
+            return self._profile
+        version = self._profile_version
+        rows = await self._execute("SELECT key, value, confidence FROM user_profile")
+        entries = {r["key"]: (r["value"], r["confidence"]) for r in rows}
+        if self._profile is None and version == self._profile_version:
+            self._profile = entries
+        return entries
+
     async def get_user_profile(self, min_confidence: float = 0.5) -> dict[str, str]:
-        rows = await self._execute(
-            "SELECT key, value FROM user_profile WHERE confidence >= ? ORDER BY confidence DESC",
-            (min_confidence,),
-        )
-        return {r["key"]: r["value"] for r in rows}
+        entries = await self._profile_entries()
+        # Highest confidence first; sorted() is stable, so ties keep table order
+        ranked = sorted(entries.items(), key=lambda item: item[1][1], reverse=True)
+        return {k: v for k, (v, c) in ranked if c >= min_confidence}
 
     async def set_profile_key(self, key: str, value: str, confidence: float = 1.0) -> None:
         # Only overwrite if new confidence is significantly higher
-        existing = await self._execute("SELECT confidence FROM user_profile WHERE key = ?", (key,))
-        if existing:
-            existing_confidence = existing[0]["confidence"]
-            if confidence <= existing_confidence + 0.1:
-                logger.debug("profile_not_updated_lower_confidence", key=key)
-                return
+        existing = (await self._profile_entries()).get(key)
+        if existing is not None and confidence <= existing[1] + 0.1:
+            logger.debug("profile_not_updated_lower_confidence", key=key)
+            return
 
         await self._execute(
             "INSERT OR REPLACE INTO user_profile (key, value, confidence, updated_at) "
             "VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
             (key, value, confidence),
         )
+        self._profile_version += 1
+        self._profile_text.clear()
+        if self._profile is not None:
+            # REPLACE re-inserts the row with a new rowid: move the key to the end too
+            self._profile.pop(key, None)
+            self._profile[key] = (value, confidence)
 
     async def get_profile_as_text(self, min_confidence: float = 0.5) -> str | None:
+        if min_confidence in self._profile_text:
+            return self._profile_text[min_confidence]
+        version = self._profile_version
         profile = await self.get_user_profile(min_confidence=min_confidence)
-        if not profile:
-            return None
-        lines = [f"- {k}: {v}" for k, v in profile.items()]
-        return "\n".join(lines)
+        text = "\n".join(f"- {k}: {v}" for k, v in profile.items()) if profile else None
+        if version == self._profile_version:
+            self._profile_text[min_confidence] = text
+        return text
 
     # --- Session Summaries ---
 
@@ -300,6 +470,7 @@ class MemoryStore:
             "DELETE FROM conversations WHERE timestamp < datetime('now', ? || ' days')",
             (f"-{int(conversations_ttl_days)}",),
         )
+        self._forget_history()
         await self._execute(
             "DELETE FROM traces WHERE timestamp < datetime('now', ? || ' days')",
             (f"-{int(traces_ttl_days)}",),
@@ -314,9 +485,17 @@ class MemoryStore:
             "WHERE updated_at < datetime('now', '-30 days')"
         )
         await self._execute("DELETE FROM user_profile WHERE confidence < 0.1")
+        self._profile_version += 1
+        self._profile_text.clear()
+        self._profile = None
         logger.info("profile_confidence_decayed")
 
     async def close(self) -> None:
+        await self.flush_traces()
+        for task in list(self._background_tasks):
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._trace_queue = None
         if self._conn:
             self._conn.close()
             self._conn = None
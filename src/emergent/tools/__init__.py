@@ -36,6 +36,7 @@ def create_registry(
             input_schema=files.FILE_READ_DEFINITION["input_schema"],
             handler=files.file_read,
             safety_tier=SafetyTier.TIER_1_AUTO,
+            idempotent=True,
         )
     )
 
@@ -80,6 +81,7 @@ def create_registry(
             input_schema=files.LIST_DIRECTORY_DEFINITION["input_schema"],
             handler=files.list_directory,
             safety_tier=SafetyTier.TIER_1_AUTO,
+            idempotent=True,
         )
     )
 
@@ -91,6 +93,7 @@ def create_registry(
             input_schema=files.DIRECTORY_TREE_DEFINITION["input_schema"],
             handler=files.directory_tree,
             safety_tier=SafetyTier.TIER_1_AUTO,
+            idempotent=True,
         )
     )
 
@@ -102,6 +105,7 @@ def create_registry(
             input_schema=files.SEARCH_FILES_DEFINITION["input_schema"],
             handler=files.search_files,
             safety_tier=SafetyTier.TIER_1_AUTO,
+            idempotent=True,
         )
     )
 
@@ -113,6 +117,7 @@ def create_registry(
             input_schema=files.SEARCH_IN_FILES_DEFINITION["input_schema"],
             handler=files.search_in_files,
             safety_tier=SafetyTier.TIER_1_AUTO,
+            idempotent=True,
         )
     )
 
@@ -124,6 +129,7 @@ def create_registry(
             input_schema=files.FILE_INFO_DEFINITION["input_schema"],
             handler=files.file_info,
             safety_tier=SafetyTier.TIER_1_AUTO,
+            idempotent=True,
         )
     )
 
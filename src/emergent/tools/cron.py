@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import uuid
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping
+from itertools import pairwise
+from types import MappingProxyType
 from typing import Any
 
 import structlog
@@ -16,9 +18,14 @@ logger = structlog.get_logger(__name__)
 
 MIN_INTERVAL_MINUTES = 5
 
+# Textual reference resolved by APScheduler at fire time — the job store keeps
+# this string instead of serializing the function object.
+_RUN_PROMPT_JOB_REF = "emergent.tools.cron:_run_prompt_job"
+
 # Module-level singletons
 _scheduler: AsyncIOScheduler | None = None
 _run_callback: Callable[[str], Awaitable[str]] | None = None
+_persistence_label = "en memoria"
 
 
 def init_scheduler(
@@ -32,7 +39,7 @@ def init_scheduler(
         db_url: SQLAlchemy URL, e.g. 'sqlite:////abs/path/to/emergent.db'
         run_callback: async function(prompt) -> str called when a job fires.
     """
-    global _scheduler, _run_callback
+    global _scheduler, _run_callback, _persistence_label
     _run_callback = run_callback
 
     from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
@@ -40,50 +47,51 @@ def init_scheduler(
     _scheduler = AsyncIOScheduler(
         jobstores={"default": SQLAlchemyJobStore(url=db_url)},
     )
+    _persistence_label = "con persistencia SQLite"
     logger.info("scheduler_initialized", db_url=db_url, has_callback=run_callback is not None)
     return _scheduler
 
 
 def get_scheduler() -> AsyncIOScheduler:
-    global _scheduler
+    global _scheduler, _persistence_label
     if _scheduler is None:
         # Fallback: in-memory scheduler (no persistence) — for tests or headless use
         _scheduler = AsyncIOScheduler()
+        _persistence_label = "en memoria"
     return _scheduler
 
 
 async def _run_prompt_job(prompt: str) -> None:
     """Top-level job function (picklable). Calls the module-level run_callback."""
-    logger.info("cron_job_fired", prompt=prompt[:60])
+    preview = prompt[:60]
+    logger.info("cron_job_fired", prompt=preview)
     cb = _run_callback
     if cb is None:
-        logger.warning("cron_job_no_callback", prompt=prompt[:60])
+        logger.warning("cron_job_no_callback", prompt=preview)
         return
     try:
         result = await cb(prompt)
         logger.info("cron_job_done", result_len=len(result))
     except Exception as e:
-        logger.error("cron_job_failed", error=str(e), prompt=prompt[:60])
+        logger.error("cron_job_failed", error=str(e), prompt=preview)
+
 
+async def cron_schedule(tool_input: dict[str, Any]) -> str:
+    """Create, list, or delete scheduled jobs.
 
-async def cron_schedule(
-    tool_input: dict[str, Any],
-    run_agent_callback: Callable[[str], Awaitable[str]] | None = None,
-) -> str:
-    """Create, list, or delete scheduled jobs."""
+    Jobs always fire through _run_prompt_job, which reaches the agent via the
+    callback registered in init_scheduler — never via a closure, since the
+    SQLAlchemy job store must be able to pickle the job and its kwargs.
+    """
     action = str(tool_input.get("action", "list"))
 
-    if action == "list":
-        return _list_jobs()
-    elif action == "create":
-        return await _create_job(tool_input)
-    elif action == "delete":
-        return _delete_job(tool_input)
-    else:
+    handler = _ACTIONS.get(action)
+    if handler is None:
         return f"Error: unknown action '{action}'. Use 'create', 'list', or 'delete'."
+    return await handler(tool_input)
 
 
-def _list_jobs() -> str:
+async def _list_jobs(tool_input: dict[str, Any]) -> str:
     scheduler = get_scheduler()
     jobs = scheduler.get_jobs()
     if not jobs:
@@ -95,6 +103,47 @@ def _list_jobs() -> str:
     return "\n".join(lines)
 
 
+def _expand_minute_part(part: str) -> range | None:
+    """Minutes one comma-separated part fires on: '*', 'n', 'a-b', each optionally '/step'."""
+    base, _, step_str = part.partition("/")
+    try:
+        step = int(step_str) if step_str else 1
+        if base == "*":
+            start, end = 0, 59
+        elif "-" in base:
+            low, _, high = base.partition("-")
+            start, end = int(low), int(high)
+        else:
+            start = int(base)
+            end = 59 if step_str else start  # 'n/step' runs from n to the end of the hour
+    except ValueError:
+        return None
+    if step < 1:
+        return None
+    return range(start, end + 1, step)
+
+
+def _violates_min_interval(cron_expr: str) -> bool:
+    """Check the minute field for schedules firing more often than MIN_INTERVAL_MINUTES."""
+    fields = cron_expr.split()
+    if not fields:
+        return False
+
+    minutes: set[int] = set()
+    for part in fields[0].split(","):
+        expanded = _expand_minute_part(part)
+        if expanded is None:
+            return False  # malformed — let CronTrigger report it
+        minutes.update(expanded)
+
+    if len(minutes) < 2:
+        return False
+    ordered = sorted(minutes)
+    gaps = [b - a for a, b in pairwise(ordered)]
+    gaps.append(60 - ordered[-1] + ordered[0])  # wrap into the next hour
+    return min(gaps) < MIN_INTERVAL_MINUTES
+
+
 async def _create_job(tool_input: dict[str, Any]) -> str:
     cron_expr = str(tool_input.get("cron_expression", ""))
     prompt = str(tool_input.get("prompt", "")).strip()
@@ -118,17 +167,24 @@ async def _create_job(tool_input: dict[str, Any]) -> str:
                 "CRON_PROMPT_BLOCKED: cron prompts cannot contain write/destructive intent"
             )
 
+    if _violates_min_interval(cron_expr):
+        return (
+            f"Error: cron expression '{cron_expr}' fires more often than "
+            f"every {MIN_INTERVAL_MINUTES} minutes"
+        )
+
     try:
         trigger = CronTrigger.from_crontab(cron_expr)
     except Exception as e:
         return f"Error: invalid cron expression '{cron_expr}': {e}"
 
+    preview = prompt[:60]
     scheduler = get_scheduler()
     scheduler.add_job(
-        _run_prompt_job,
+        _RUN_PROMPT_JOB_REF,
         trigger=trigger,
         id=job_id,
-        name=f"emergent:{prompt[:30]}",
+        name=f"emergent:{preview[:30]}",
         replace_existing=True,
         kwargs={"prompt": prompt},
     )
@@ -136,12 +192,11 @@ async def _create_job(tool_input: dict[str, Any]) -> str:
     if not scheduler.running:
         scheduler.start()
 
-    persistence = "con persistencia SQLite" if hasattr(scheduler, "_jobstores") and "default" in scheduler._jobstores else "en memoria"
-    logger.info("cron_job_created", job_id=job_id, cron=cron_expr, prompt=prompt[:50])
-    return f"Job '{job_id}' creado ({persistence}) con cron '{cron_expr}'."
+    logger.info("cron_job_created", job_id=job_id, cron=cron_expr, prompt=preview)
+    return f"Job '{job_id}' creado ({_persistence_label}) con cron '{cron_expr}'."
 
 
-def _delete_job(tool_input: dict[str, Any]) -> str:
+async def _delete_job(tool_input: dict[str, Any]) -> str:
     job_id = str(tool_input.get("job_id", ""))
     if not job_id:
         return "Error: job_id is required"
@@ -156,37 +211,51 @@ def _delete_job(tool_input: dict[str, Any]) -> str:
     return f"Job '{job_id}' eliminado."
 
 
-TOOL_DEFINITION = {
-    "name": "cron_schedule",
-    "description": (
-        "Create, list, or delete scheduled cron jobs. "
-        "Jobs run the agent with a predefined prompt at the scheduled time. "
-        "Cron prompts must be read-only in intent (no destructive actions). "
-        "Minimum interval: every 5 minutes. "
-        "Actions: 'create' (TIER_2, needs confirmation), 'list' (TIER_1), 'delete' (TIER_2)."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "action": {
-                "type": "string",
-                "enum": ["create", "list", "delete"],
-                "description": "Action to perform",
-            },
-            "job_id": {
-                "type": "string",
-                "description": "Job identifier (for create/delete). Auto-generated if not provided.",
-            },
-            "cron_expression": {
-                "type": "string",
-                "description": "Standard cron expression (e.g., '*/15 * * * *' for every 15min)",
-            },
-            "prompt": {
-                "type": "string",
-                "description": "The read-only prompt to run at schedule time. Max 500 chars.",
-                "maxLength": 500,
+# Action → handler dispatch table for cron_schedule
+_ACTIONS: dict[str, Callable[[dict[str, Any]], Awaitable[str]]] = {
+    "list": _list_jobs,
+    "create": _create_job,
+    "delete": _delete_job,
+}
+
+
+TOOL_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "cron_schedule",
+        "description": (
+            "Create, list, or delete scheduled cron jobs. "
+            "Jobs run the agent with a predefined prompt at the scheduled time. "
+            "Cron prompts must be read-only in intent (no destructive actions). "
+            "Minimum interval: every 5 minutes. "
+            "Actions: 'create' (TIER_2, needs confirmation), 'list' (TIER_1), 'delete' (TIER_2)."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["create", "list", "delete"],
+                    "description": "Action to perform",
+                },
+                "job_id": {
+                    "type": "string",
+                    "description": (
+                        "Job identifier (for create/delete). Auto-generated if not provided."
+                    ),
+                },
+                "cron_expression": {
+                    "type": "string",
+                    "description": (
+                        "Standard cron expression (e.g., '*/15 * * * *' for every 15min)"
+                    ),
+                },
+                "prompt": {
+                    "type": "string",
+                    "description": "The read-only prompt to run at schedule time. Max 500 chars.",
+                    "maxLength": 500,
+                },
             },
+            "required": ["action"],
         },
-        "required": ["action"],
-    },
-}
+    }
+)
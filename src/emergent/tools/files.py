@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import fnmatch
+import mmap
+import os
 import re
 import shutil
 import stat
+from collections.abc import Callable, Iterator, Mapping
 from datetime import UTC, datetime
+from itertools import islice
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import structlog
@@ -37,37 +44,60 @@ _SENSITIVE_PATTERNS = [
 
 _SENSITIVE_EXTENSIONS = [".pem", ".key", ".p12", ".pfx"]
 
+# Single-pass scan of the lowercased path: substring patterns, then blocked extensions
+_SENSITIVE_RE = re.compile(
+    "|".join(re.escape(p.lower()) for p in _SENSITIVE_PATTERNS)
+    + "|(?P<ext>(?:"
+    + "|".join(re.escape(e) for e in _SENSITIVE_EXTENSIONS)
+    + ")$)"
+)
+
 
 def _resolve_path(path_str: str) -> Path:
     """Resolve path relative to $HOME, blocking traversal and sensitive files."""
-    if path_str.startswith("/"):
-        resolved = Path(path_str).resolve()
-    else:
-        resolved = (SANDBOX_ROOT / path_str).resolve()
+    root = os.fspath(SANDBOX_ROOT)
+
+    # Block '..' traversal attempts. Pure string check, so it runs before any syscall
+    if ".." in path_str.split("/"):
+        raise SafetyViolationError(f"PATH_TRAVERSAL: '..' not allowed in path '{path_str}'")
+
+    # String-level path ops: avoids allocating intermediate Path objects per call.
+    # realpath stays mandatory, and uncached: any parent component may be (or may later
+    # be swapped for) a symlink out of $HOME.
+    raw = path_str if path_str.startswith("/") else os.path.join(root, path_str)
+    resolved_str = os.path.realpath(raw)
 
     # Block path traversal
-    try:
-        resolved.relative_to(SANDBOX_ROOT)
-    except ValueError:
+    if resolved_str != root and not resolved_str.startswith(os.path.join(root, "")):
         raise SafetyViolationError(f"OUTSIDE_SANDBOX: path '{path_str}' resolves outside $HOME")
 
-    # Block '..' traversal attempts
-    if ".." in Path(path_str).parts:
-        raise SafetyViolationError(f"PATH_TRAVERSAL: '..' not allowed in path '{path_str}'")
+    resolved = Path(resolved_str)
 
     # Check sensitive paths
-    path_lower = str(resolved).lower()
-    rel_str = str(resolved.relative_to(SANDBOX_ROOT)).lower()
+    match = _SENSITIVE_RE.search(resolved_str.lower())
+    if match:
+        if match.group("ext"):
+            raise SafetyViolationError(
+                f"SENSITIVE_PATH: extension '{match.group('ext')}' is blocked"
+            )
+        logger.warning("sensitive_path_blocked", path=resolved_str, pattern=match.group(0))
+        raise SafetyViolationError(f"SENSITIVE_PATH: '{resolved.name}' is a sensitive file")
 
-    for sensitive in _SENSITIVE_PATTERNS:
-        if sensitive.lower() in path_lower:
-            logger.warning("sensitive_path_blocked", path=str(resolved), pattern=sensitive)
-            raise SafetyViolationError(f"SENSITIVE_PATH: '{resolved.name}' is a sensitive file")
+    return resolved
 
-    if resolved.suffix.lower() in _SENSITIVE_EXTENSIONS:
-        raise SafetyViolationError(f"SENSITIVE_PATH: extension '{resolved.suffix}' is blocked")
 
-    return resolved
+def _read_text_sync(resolved: Path, max_chars: int) -> tuple[str, bool]:
+    """Blocking read for file_read, run in a worker thread. Returns (content, truncated)."""
+    # Read at most one char past the limit so large files cost O(max_chars), not O(size)
+    with open(resolved, encoding="utf-8", errors="replace") as f:
+        content = f.read(max_chars + 1)
+
+    truncated = False
+    if len(content) > max_chars:
+        content = content[:max_chars] + "\n[... file truncated]"
+        truncated = True
+
+    return content, truncated
 
 
 async def file_read(tool_input: dict[str, Any]) -> str:
@@ -88,20 +118,45 @@ async def file_read(tool_input: dict[str, Any]) -> str:
         return f"Error: '{resolved}' is not a file"
 
     try:
-        size_bytes = resolved.stat().st_size
-        content = resolved.read_text(errors="replace")
-    except PermissionError:
-        raise SafetyViolationError(f"PERMISSION_DENIED: cannot read '{resolved}'")
-
-    truncated = False
-    if len(content) > max_chars:
-        content = content[:max_chars] + "\n[... file truncated]"
-        truncated = True
+        content, truncated = await asyncio.to_thread(_read_text_sync, resolved, max_chars)
+    except PermissionError as err:
+        raise SafetyViolationError(f"PERMISSION_DENIED: cannot read '{resolved}'") from err
 
-    logger.info("file_read", path=str(resolved), size_bytes=size_bytes, truncated=truncated)
+    logger.info("file_read", path=str(resolved), chars_read=len(content), truncated=truncated)
     return content
 
 
+_WRITE_FLAGS = {
+    # O_EXCL makes create atomic: fails if the file exists (no TOCTOU race)
+    "create": os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+    "overwrite": os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+    "append": os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+}
+_WRITE_ACTIONS = {"create": "created", "overwrite": "overwritten", "append": "appended"}
+
+
+def _write_bytes_sync(resolved: Path, data: bytes, mode: str) -> str | None:
+    """Blocking write for file_write, run in a worker thread.
+
+    Returns the action performed, or None if create mode found an existing file.
+    """
+    # Create parent directories if needed
+    resolved.parent.mkdir(parents=True, exist_ok=True)
+
+    # Raw fd write: the payload is already encoded, so skip the buffered/text io layers
+    try:
+        fd = os.open(resolved, _WRITE_FLAGS[mode], 0o666)
+    except FileExistsError:
+        return None
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+    return _WRITE_ACTIONS[mode]
+
+
 async def file_write(tool_input: dict[str, Any]) -> str:
     """Write/create a file in $HOME sandbox."""
     path_str = str(tool_input.get("path", ""))
@@ -114,91 +169,81 @@ async def file_write(tool_input: dict[str, Any]) -> str:
     if not path_str:
         return "Error: path is required"
 
-    if len(content.encode()) > MAX_WRITE_BYTES:
+    # Encode once: the byte length feeds the size check, the write and the log
+    data = content.encode("utf-8")
+    if len(data) > MAX_WRITE_BYTES:
         return f"Error: content exceeds max size of {MAX_WRITE_BYTES // 1024}KB"
 
     resolved = _resolve_path(path_str)
 
-    # Create parent directories if needed
-    resolved.parent.mkdir(parents=True, exist_ok=True)
-
     try:
-        if mode == "create":
-            try:
-                # Atomic create: fails if file exists (no TOCTOU race)
-                with open(resolved, "x", encoding="utf-8") as f:
-                    f.write(content)
-            except FileExistsError:
-                return "Error: file already exists. Use mode='overwrite' to replace it."
-            action = "created"
-        elif mode == "overwrite":
-            resolved.write_text(content)
-            action = "overwritten"
-        elif mode == "append":
-            with open(resolved, "a") as f:
-                f.write(content)
-            action = "appended"
-        else:
-            action = "unknown"
-    except PermissionError:
-        raise SafetyViolationError(f"PERMISSION_DENIED: cannot write '{resolved}'")
-
-    logger.info("file_write", path=str(resolved), mode=mode, bytes_written=len(content.encode()))
-    return f"File {action}: {resolved} ({len(content.encode())} bytes)"
-
-
-FILE_READ_DEFINITION = {
-    "name": "file_read",
-    "description": (
-        "Read the content of a file. Path is relative to $HOME. "
-        "Sensitive files (.env, .ssh keys, secrets) are blocked. "
-        "Output is truncated at 10,000 chars."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "path": {
-                "type": "string",
-                "description": "File path relative to $HOME (e.g., 'Documents/notes.txt')",
-            },
-            "max_chars": {
-                "type": "integer",
-                "description": "Max characters to return. Default 10000.",
-                "default": 10000,
+        action = await asyncio.to_thread(_write_bytes_sync, resolved, data, mode)
+    except PermissionError as err:
+        raise SafetyViolationError(f"PERMISSION_DENIED: cannot write '{resolved}'") from err
+
+    if action is None:
+        return "Error: file already exists. Use mode='overwrite' to replace it."
+
+    logger.info("file_write", path=str(resolved), mode=mode, bytes_written=len(data))
+    return f"File {action}: {resolved} ({len(data)} bytes)"
+
+
+FILE_READ_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "file_read",
+        "description": (
+            "Read the content of a file. Path is relative to $HOME. "
+            "Sensitive files (.env, .ssh keys, secrets) are blocked. "
+            "Output is truncated at 10,000 chars."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "File path relative to $HOME (e.g., 'Documents/notes.txt')",
+                },
+                "max_chars": {
+                    "type": "integer",
+                    "description": "Max characters to return. Default 10000.",
+                    "default": 10000,
+                },
             },
+            "required": ["path"],
         },
-        "required": ["path"],
-    },
-}
-
-FILE_WRITE_DEFINITION = {
-    "name": "file_write",
-    "description": (
-        "Create or write a file in $HOME. Requires user confirmation if file already exists. "
-        "Mode: 'create' (fails if exists), 'overwrite' (replaces), 'append' (adds to end). "
-        "Max content size: 1MB."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "path": {
-                "type": "string",
-                "description": "File path relative to $HOME",
-            },
-            "content": {
-                "type": "string",
-                "description": "Content to write",
-            },
-            "mode": {
-                "type": "string",
-                "enum": ["create", "overwrite", "append"],
-                "description": "Write mode. Default: 'create'",
-                "default": "create",
+    }
+)
+
+FILE_WRITE_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "file_write",
+        "description": (
+            "Create or write a file in $HOME. Requires user confirmation if file already exists. "
+            "Mode: 'create' (fails if exists), 'overwrite' (replaces), 'append' (adds to end). "
+            "Max content size: 1MB."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "File path relative to $HOME",
+                },
+                "content": {
+                    "type": "string",
+                    "description": "Content to write",
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": ["create", "overwrite", "append"],
+                    "description": "Write mode. Default: 'create'",
+                    "default": "create",
+                },
             },
+            "required": ["path", "content"],
         },
-        "required": ["path", "content"],
-    },
-}
+    }
+)
 
 
 # ---------------------------------------------------------------------------
@@ -206,14 +251,33 @@ FILE_WRITE_DEFINITION = {
 # ---------------------------------------------------------------------------
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def _format_size(size: int) -> str:
     """Format byte size as human-readable string."""
-    fsize = float(size)
-    for unit in ("B", "KB", "MB", "GB"):
-        if fsize < 1024:
-            return f"{fsize:.0f}{unit}" if unit == "B" else f"{fsize:.1f}{unit}"
-        fsize /= 1024
-    return f"{fsize:.1f}TB"
+    # Unit index straight from the bit length: every 10 bits is one factor of 1024
+    idx = min(max(0, (size.bit_length() - 1) // 10), 4)
+    if idx == 0:
+        return f"{size}B"
+    return f"{size / (1 << (idx * 10)):.1f}{_SIZE_UNITS[idx]}"
+
+
+def _sorted_entries(
+    path: str | Path, show_hidden: bool = False, limit: int | None = None
+) -> list[tuple[bool, os.DirEntry[str]]]:
+    """List a directory as (is_dir, entry), dirs first, then case-insensitive by name.
+
+    scandir's DirEntry caches the file type from readdir, and the sort keys are
+    built once per entry rather than through a key callback. With ``limit``, at
+    most that many visible entries are read before sorting.
+    """
+    with os.scandir(path) as it:
+        visible = (e for e in it if show_hidden or not e.name.startswith("."))
+        keyed = [(not e.is_dir(), e.name.lower(), e.name, e) for e in islice(visible, limit)]
+    # Names are unique within a directory, so the DirEntry itself is never compared
+    keyed.sort()
+    return [(not is_file, e) for is_file, _, _, e in keyed]
 
 
 async def list_directory(tool_input: dict[str, Any]) -> str:
@@ -229,25 +293,20 @@ async def list_directory(tool_input: dict[str, Any]) -> str:
         return f"Error: '{resolved}' is not a directory"
 
     try:
-        entries = list(resolved.iterdir())
+        entries = _sorted_entries(resolved, show_hidden=show_hidden)
     except PermissionError as err:
         raise SafetyViolationError(f"PERMISSION_DENIED: cannot list '{resolved}'") from err
 
-    if not show_hidden:
-        entries = [e for e in entries if not e.name.startswith(".")]
-
-    dirs = sorted([e for e in entries if e.is_dir()], key=lambda p: p.name.lower())
-    files = sorted([e for e in entries if not e.is_dir()], key=lambda p: p.name.lower())
-
     lines: list[str] = []
-    for d in dirs:
-        lines.append(f"[DIR]  {d.name}/")
-    for f in files:
+    for is_dir, e in entries:
+        if is_dir:
+            lines.append(f"[DIR]  {e.name}/")
+            continue
         try:
-            size = f.stat().st_size
+            size = e.stat().st_size
         except OSError:
             size = 0
-        lines.append(f"[FILE] {f.name} ({_format_size(size)})")
+        lines.append(f"[FILE] {e.name} ({_format_size(size)})")
 
     if not lines:
         return f"Directory '{path_str}' is empty"
@@ -256,30 +315,32 @@ async def list_directory(tool_input: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-LIST_DIRECTORY_DEFINITION = {
-    "name": "list_directory",
-    "description": (
-        "List contents of a directory in $HOME. "
-        "Shows directories first, then files with sizes. "
-        "Hidden files (dotfiles) are excluded by default."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "path": {
-                "type": "string",
-                "description": "Directory path relative to $HOME. Default: $HOME",
-                "default": ".",
-            },
-            "show_hidden": {
-                "type": "boolean",
-                "description": "Include hidden files/directories (dotfiles). Default: false",
-                "default": False,
+LIST_DIRECTORY_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "list_directory",
+        "description": (
+            "List contents of a directory in $HOME. "
+            "Shows directories first, then files with sizes. "
+            "Hidden files (dotfiles) are excluded by default."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Directory path relative to $HOME. Default: $HOME",
+                    "default": ".",
+                },
+                "show_hidden": {
+                    "type": "boolean",
+                    "description": "Include hidden files/directories (dotfiles). Default: false",
+                    "default": False,
+                },
             },
+            "required": [],
         },
-        "required": [],
-    },
-}
+    }
+)
 
 
 # ---------------------------------------------------------------------------
@@ -289,32 +350,33 @@ LIST_DIRECTORY_DEFINITION = {
 _MAX_TREE_ENTRIES = 200
 
 
-def _build_tree(path: Path, prefix: str, depth: int, max_depth: int, lines: list[str]) -> None:
+def _build_tree(
+    path: str | Path, prefix: str, depth: int, max_depth: int, lines: list[str]
+) -> None:
     """Recursively build tree lines."""
     if depth > max_depth or len(lines) >= _MAX_TREE_ENTRIES:
         return
 
     try:
-        entries = sorted(path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower()))
+        # Wide directories: read only what the remaining line budget can show (+1 so
+        # the truncation marker still fires)
+        entries = _sorted_entries(path, limit=_MAX_TREE_ENTRIES - len(lines) + 1)
     except PermissionError:
         return
 
-    # Filter hidden
-    entries = [e for e in entries if not e.name.startswith(".")]
-
-    for i, entry in enumerate(entries):
+    for i, (is_dir, entry) in enumerate(entries):
         if len(lines) >= _MAX_TREE_ENTRIES:
             lines.append(f"{prefix}... (truncated at {_MAX_TREE_ENTRIES} entries)")
             return
 
         is_last = i == len(entries) - 1
         connector = "└── " if is_last else "├── "
-        suffix = "/" if entry.is_dir() else ""
+        suffix = "/" if is_dir else ""
         lines.append(f"{prefix}{connector}{entry.name}{suffix}")
 
-        if entry.is_dir() and depth < max_depth:
+        if is_dir and depth < max_depth:
             extension = "    " if is_last else "│   "
-            _build_tree(entry, prefix + extension, depth + 1, max_depth, lines)
+            _build_tree(entry.path, prefix + extension, depth + 1, max_depth, lines)
 
 
 async def directory_tree(tool_input: dict[str, Any]) -> str:
@@ -337,29 +399,31 @@ async def directory_tree(tool_input: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-DIRECTORY_TREE_DEFINITION = {
-    "name": "directory_tree",
-    "description": (
-        "Show a recursive directory tree with configurable depth. "
-        "Max depth is 5, max entries is 200. Hidden files are excluded."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "path": {
-                "type": "string",
-                "description": "Directory path relative to $HOME. Default: $HOME",
-                "default": ".",
-            },
-            "max_depth": {
-                "type": "integer",
-                "description": "Maximum recursion depth (1-5). Default: 3",
-                "default": 3,
+DIRECTORY_TREE_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "directory_tree",
+        "description": (
+            "Show a recursive directory tree with configurable depth. "
+            "Max depth is 5, max entries is 200. Hidden files are excluded."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Directory path relative to $HOME. Default: $HOME",
+                    "default": ".",
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "description": "Maximum recursion depth (1-5). Default: 3",
+                    "default": 3,
+                },
             },
+            "required": [],
         },
-        "required": [],
-    },
-}
+    }
+)
 
 
 # ---------------------------------------------------------------------------
@@ -367,6 +431,44 @@ DIRECTORY_TREE_DEFINITION = {
 # ---------------------------------------------------------------------------
 
 
+_GLOB_META = frozenset("*?[")
+
+
+def _glob_matcher(pattern: str) -> Callable[[str], bool]:
+    """Compile a glob once: '*.ext' becomes a suffix test, anything else a translated regex."""
+    suffix = pattern[1:]
+    if pattern.startswith("*") and not _GLOB_META.intersection(suffix):
+        return lambda name: name.endswith(suffix)
+    regex = re.compile(fnmatch.translate(pattern))
+    return lambda name: regex.match(name) is not None
+
+
+def _walk_matches(root: Path, pattern: str) -> Iterator[tuple[str, bool]]:
+    """Yield (path, is_dir) for non-hidden entries under root whose name matches a glob.
+
+    Hidden directories are pruned before descent, so trees like .git or .cache are
+    never read. Patterns containing '/' are matched against the trailing parts of the
+    path relative to root, never against directories above it.
+    """
+    depth = pattern.count("/")
+    matches = _glob_matcher(pattern)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for names, is_dir in ((dirnames, True), (filenames, False)):
+            for name in names:
+                if is_dir or not name.startswith("."):
+                    full = os.path.join(dirpath, name)
+                    if depth:
+                        parts = os.path.relpath(full, root).split("/")
+                        if len(parts) <= depth:
+                            continue
+                        candidate = "/".join(parts[-(depth + 1) :])
+                    else:
+                        candidate = name
+                    if matches(candidate):
+                        yield full, is_dir
+
+
 async def search_files(tool_input: dict[str, Any]) -> str:
     """Search for files by glob pattern."""
     path_str = str(tool_input.get("path", "."))
@@ -383,21 +485,10 @@ async def search_files(tool_input: dict[str, Any]) -> str:
         return f"Error: directory '{resolved}' does not exist"
 
     results: list[str] = []
-    try:
-        for match in resolved.rglob(pattern):
-            if len(results) >= max_results:
-                break
-            # Skip hidden directories/files in path
-            if any(part.startswith(".") for part in match.relative_to(resolved).parts):
-                continue
-            try:
-                rel = match.relative_to(SANDBOX_ROOT)
-            except ValueError:
-                continue
-            suffix = "/" if match.is_dir() else ""
-            results.append(f"{rel}{suffix}")
-    except PermissionError:
-        pass
+    for full, is_dir in _walk_matches(resolved, pattern):
+        results.append(os.path.relpath(full, SANDBOX_ROOT) + ("/" if is_dir else ""))
+        if len(results) >= max_results:
+            break
 
     if not results:
         return f"No files matching '{pattern}' found in '{path_str}'"
@@ -407,34 +498,36 @@ async def search_files(tool_input: dict[str, Any]) -> str:
     return header + "\n".join(results)
 
 
-SEARCH_FILES_DEFINITION = {
-    "name": "search_files",
-    "description": (
-        "Search for files matching a glob pattern recursively. "
-        "Pattern examples: '*.py', '*.txt', 'config.*'. "
-        "Returns paths relative to $HOME."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "path": {
-                "type": "string",
-                "description": "Starting directory relative to $HOME. Default: $HOME",
-                "default": ".",
-            },
-            "pattern": {
-                "type": "string",
-                "description": "Glob pattern to match (e.g., '*.py', 'config.*')",
-            },
-            "max_results": {
-                "type": "integer",
-                "description": "Maximum results to return (1-50). Default: 20",
-                "default": 20,
+SEARCH_FILES_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "search_files",
+        "description": (
+            "Search for files matching a glob pattern recursively. "
+            "Pattern examples: '*.py', '*.txt', 'config.*'. "
+            "Returns paths relative to $HOME."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Starting directory relative to $HOME. Default: $HOME",
+                    "default": ".",
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": "Glob pattern to match (e.g., '*.py', 'config.*')",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum results to return (1-50). Default: 20",
+                    "default": 20,
+                },
             },
+            "required": ["pattern"],
         },
-        "required": ["pattern"],
-    },
-}
+    }
+)
 
 
 # ---------------------------------------------------------------------------
@@ -442,15 +535,54 @@ SEARCH_FILES_DEFINITION = {
 # ---------------------------------------------------------------------------
 
 _MAX_LINE_DISPLAY = 200
-
-
-def _is_binary(path: Path) -> bool:
-    """Heuristic: file is binary if first 8KB contain null bytes."""
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+# Files are scanned in worker threads: batches pulled from the walk, a few at a time
+_SCAN_BATCH = 32
+_SCAN_CONCURRENCY = 8
+
+
+def _grep_file(
+    filepath: str, regex: re.Pattern[str], literal: bytes | None
+) -> Iterator[tuple[int, str]]:
+    """Yield (line_no, line) for matching lines of a text file; binary files yield nothing.
+
+    The file is memory-mapped so the binary sniff and the literal screen run as C-level
+    finds over the raw bytes; files that cannot contain the literal are never decoded.
+    """
+    with open(filepath, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Binary heuristic: NUL bytes in the first 8KB
+            if mm.find(b"\x00", 0, 8192) != -1:
+                return
+            if literal is not None and mm.find(literal) == -1:
+                return
+            # splitlines() on the decoded text: same line boundaries (\r\n, bare \r, ...) and
+            # numbering as text-mode reads, with terminators stripped so '$' anchors match
+            needle = literal.decode() if literal is not None else None
+            for line_no, line in enumerate(mm[:].decode("utf-8", errors="replace").splitlines(), 1):
+                if (needle is None or needle in line) and regex.search(line):
+                    yield line_no, line
+
+
+def _scan_file(
+    filepath: str, root: str, regex: re.Pattern[str], literal: bytes | None, limit: int
+) -> list[str]:
+    """Blocking scan of one file for search_in_files, returning up to limit display lines."""
+    found: list[str] = []
     try:
-        chunk = path.read_bytes()[:8192]
-        return b"\x00" in chunk
-    except OSError:
-        return True
+        rel = os.path.relpath(filepath, root)
+        for line_no, line in _grep_file(filepath, regex, literal):
+            display_line = line.strip()
+            if len(display_line) > _MAX_LINE_DISPLAY:
+                display_line = display_line[:_MAX_LINE_DISPLAY] + "..."
+            found.append(f"{rel}:{line_no}: {display_line}")
+            if len(found) >= limit:
+                break
+    except (OSError, ValueError):
+        pass
+    return found
 
 
 async def search_in_files(tool_input: dict[str, Any]) -> str:
@@ -469,41 +601,38 @@ async def search_in_files(tool_input: dict[str, Any]) -> str:
     if not resolved.exists() or not resolved.is_dir():
         return f"Error: directory '{resolved}' does not exist"
 
-    # Try to compile as regex; fall back to literal
+    # Try to compile as regex; fall back to literal. Plain-text queries also get a
+    # byte-level screen so non-matching files are rejected without decoding.
     try:
         regex = re.compile(query)
+        literal = None if _REGEX_META.intersection(query) else query.encode()
     except re.error:
         regex = re.compile(re.escape(query))
-
+        literal = query.encode()
+
+    root = os.fspath(SANDBOX_ROOT)
+    sem = asyncio.Semaphore(_SCAN_CONCURRENCY)
+
+    async def scan(filepath: str) -> list[str]:
+        async with sem:
+            return await asyncio.to_thread(_scan_file, filepath, root, regex, literal, max_results)
+
+    # Regular files only: opening a FIFO or device node would block the worker thread.
+    # The isfile() stat runs in the to_thread walk below, not on the event loop
+    candidates = (
+        fp
+        for fp, is_dir in _walk_matches(resolved, glob_pattern)
+        if not is_dir and os.path.isfile(fp)
+    )
     matches: list[str] = []
-    try:
-        for filepath in resolved.rglob(glob_pattern):
-            if len(matches) >= max_results:
-                break
-            if not filepath.is_file():
-                continue
-            # Skip hidden
-            if any(part.startswith(".") for part in filepath.relative_to(resolved).parts):
-                continue
-            if _is_binary(filepath):
-                continue
-
-            try:
-                rel = filepath.relative_to(SANDBOX_ROOT)
-                content = filepath.read_text(errors="replace")
-            except (OSError, ValueError):
-                continue
-
-            for line_no, line in enumerate(content.splitlines(), 1):
-                if len(matches) >= max_results:
-                    break
-                if regex.search(line):
-                    display_line = line.strip()
-                    if len(display_line) > _MAX_LINE_DISPLAY:
-                        display_line = display_line[:_MAX_LINE_DISPLAY] + "..."
-                    matches.append(f"{rel}:{line_no}: {display_line}")
-    except PermissionError:
-        pass
+    while len(matches) < max_results:
+        batch = await asyncio.to_thread(list, islice(candidates, _SCAN_BATCH))
+        if not batch:
+            break
+        # gather keeps walk order, so results match a sequential scan
+        for found in await asyncio.gather(*(scan(fp) for fp in batch)):
+            matches.extend(found)
+    del matches[max_results:]
 
     if not matches:
         return f"No matches for '{query}' in '{path_str}'"
@@ -513,39 +642,41 @@ async def search_in_files(tool_input: dict[str, Any]) -> str:
     return header + "\n".join(matches)
 
 
-SEARCH_IN_FILES_DEFINITION = {
-    "name": "search_in_files",
-    "description": (
-        "Search for text or regex patterns inside files (like grep). "
-        "Returns matching lines with file path and line number. "
-        "Skips binary files automatically."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "path": {
-                "type": "string",
-                "description": "Starting directory relative to $HOME. Default: $HOME",
-                "default": ".",
-            },
-            "query": {
-                "type": "string",
-                "description": "Text or regex pattern to search for",
-            },
-            "glob": {
-                "type": "string",
-                "description": "File glob filter (e.g., '*.py', '*.txt'). Default: '*'",
-                "default": "*",
-            },
-            "max_results": {
-                "type": "integer",
-                "description": "Maximum matches to return (1-50). Default: 20",
-                "default": 20,
+SEARCH_IN_FILES_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "search_in_files",
+        "description": (
+            "Search for text or regex patterns inside files (like grep). "
+            "Returns matching lines with file path and line number. "
+            "Skips binary files automatically."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Starting directory relative to $HOME. Default: $HOME",
+                    "default": ".",
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Text or regex pattern to search for",
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "File glob filter (e.g., '*.py', '*.txt'). Default: '*'",
+                    "default": "*",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum matches to return (1-50). Default: 20",
+                    "default": 20,
+                },
             },
+            "required": ["query"],
         },
-        "required": ["query"],
-    },
-}
+    }
+)
 
 
 # ---------------------------------------------------------------------------
@@ -553,6 +684,12 @@ SEARCH_IN_FILES_DEFINITION = {
 # ---------------------------------------------------------------------------
 
 
+def _format_utc(timestamp: float) -> str:
+    """Format as 'YYYY-MM-DD HH:MM:SS UTC' via isoformat, which skips strftime's format parsing."""
+    # Drop the trailing '+00:00' offset isoformat appends for aware datetimes
+    return datetime.fromtimestamp(timestamp, tz=UTC).isoformat(" ", "seconds")[:19] + " UTC"
+
+
 async def file_info(tool_input: dict[str, Any]) -> str:
     """Get file/directory metadata."""
     path_str = str(tool_input.get("path", ""))
@@ -579,9 +716,8 @@ async def file_info(tool_input: dict[str, Any]) -> str:
     else:
         file_type = "other"
     perms = stat.filemode(st.st_mode)
-    _ts_fmt = "%Y-%m-%d %H:%M:%S UTC"
-    modified = datetime.fromtimestamp(st.st_mtime, tz=UTC).strftime(_ts_fmt)
-    created = datetime.fromtimestamp(st.st_ctime, tz=UTC).strftime(_ts_fmt)
+    modified = _format_utc(st.st_mtime)
+    created = _format_utc(st.st_ctime)
 
     info_lines = [
         f"Path: {resolved}",
@@ -596,23 +732,25 @@ async def file_info(tool_input: dict[str, Any]) -> str:
     return "\n".join(info_lines)
 
 
-FILE_INFO_DEFINITION = {
-    "name": "file_info",
-    "description": (
-        "Get metadata about a file or directory: type, size, permissions, "
-        "modification and creation timestamps."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "path": {
-                "type": "string",
-                "description": "File or directory path relative to $HOME",
+FILE_INFO_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "file_info",
+        "description": (
+            "Get metadata about a file or directory: type, size, permissions, "
+            "modification and creation timestamps."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "File or directory path relative to $HOME",
+                },
             },
+            "required": ["path"],
         },
-        "required": ["path"],
-    },
-}
+    }
+)
 
 
 # ---------------------------------------------------------------------------
@@ -651,28 +789,30 @@ async def file_move(tool_input: dict[str, Any]) -> str:
     return f"Moved: {source} → {destination}"
 
 
-FILE_MOVE_DEFINITION = {
-    "name": "file_move",
-    "description": (
-        "Move or rename a file or directory within $HOME. "
-        "Both source and destination must be inside $HOME. "
-        "Fails if destination already exists."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "source": {
-                "type": "string",
-                "description": "Source path relative to $HOME",
-            },
-            "destination": {
-                "type": "string",
-                "description": "Destination path relative to $HOME",
+FILE_MOVE_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "file_move",
+        "description": (
+            "Move or rename a file or directory within $HOME. "
+            "Both source and destination must be inside $HOME. "
+            "Fails if destination already exists."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "source": {
+                    "type": "string",
+                    "description": "Source path relative to $HOME",
+                },
+                "destination": {
+                    "type": "string",
+                    "description": "Destination path relative to $HOME",
+                },
             },
+            "required": ["source", "destination"],
         },
-        "required": ["source", "destination"],
-    },
-}
+    }
+)
 
 
 # ---------------------------------------------------------------------------
@@ -704,8 +844,10 @@ async def file_delete(tool_input: dict[str, Any]) -> str:
             return f"Deleted file: {resolved}"
         elif resolved.is_dir():
             if not recursive:
-                # Check if empty
-                if any(resolved.iterdir()):
+                # Check if empty: scandir stops after one entry, iterdir lists everything
+                with os.scandir(resolved) as it:
+                    empty = next(it, None) is None
+                if not empty:
                     return (
                         f"Error: directory '{resolved}' is not empty. "
                         "Use recursive=true to delete non-empty directories."
@@ -721,26 +863,28 @@ async def file_delete(tool_input: dict[str, Any]) -> str:
         raise SafetyViolationError(f"PERMISSION_DENIED: cannot delete '{resolved}'") from err
 
 
-FILE_DELETE_DEFINITION = {
-    "name": "file_delete",
-    "description": (
-        "Delete a file or directory within $HOME. "
-        "Non-empty directories require recursive=true. "
-        "Cannot delete the sandbox root ($HOME)."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "path": {
-                "type": "string",
-                "description": "Path to delete, relative to $HOME",
-            },
-            "recursive": {
-                "type": "boolean",
-                "description": "Delete non-empty directories recursively. Default: false",
-                "default": False,
+FILE_DELETE_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "file_delete",
+        "description": (
+            "Delete a file or directory within $HOME. "
+            "Non-empty directories require recursive=true. "
+            "Cannot delete the sandbox root ($HOME)."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Path to delete, relative to $HOME",
+                },
+                "recursive": {
+                    "type": "boolean",
+                    "description": "Delete non-empty directories recursively. Default: false",
+                    "default": False,
+                },
             },
+            "required": ["path"],
         },
-        "required": ["path"],
-    },
-}
+    }
+)
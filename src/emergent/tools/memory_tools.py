@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import re
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 import structlog
@@ -13,31 +16,43 @@ from emergent.memory.store import MemoryStore
 
 logger = structlog.get_logger(__name__)
 
-# Secret patterns to block from being stored in memory
-_SECRET_PATTERNS = [
-    re.compile(r, re.IGNORECASE)
-    for r in [
-        r"sk-ant-api\d{2}-",
-        r"sk-[a-zA-Z0-9]{40,}",
-        r"(?i)password\s*[=:]\s*\S+",
-        r"(?i)token\s*[=:]\s*\S{20,}",
-        r"ghp_[A-Za-z0-9]{20,}",
-        r"[A-Z0-9]{20}:[A-Za-z0-9/+]{40}",  # AWS-style key
-        r"-----BEGIN (RSA|EC|OPENSSH) PRIVATE KEY-----",
-    ]
-]
+# Secret patterns to block from being stored in memory, keyed by the kind logged on a hit
+_SECRET_PATTERNS = {
+    "anthropic_key": r"sk-ant-api\d{2}-",
+    "api_key": r"sk-[a-zA-Z0-9]{40,}",
+    "password": r"password\s*[=:]\s*\S+",
+    "token": r"token\s*[=:]\s*\S{20,}",
+    "github_token": r"ghp_[A-Za-z0-9]{20,}",
+    "aws_key": r"[A-Z0-9]{20}:[A-Za-z0-9/+]{40}",
+    "private_key": r"-----BEGIN (RSA|EC|OPENSSH) PRIVATE KEY-----",
+}
+
+# One alternation so a store call costs a single search instead of one per pattern;
+# the named group that hit says which kind of secret it was
+_SECRET_RE = re.compile(
+    "|".join(f"(?P<{kind}>{p})" for kind, p in _SECRET_PATTERNS.items()), re.IGNORECASE
+)
 
 
 def _check_for_secrets(value: str) -> None:
-    for pattern in _SECRET_PATTERNS:
-        if pattern.search(value):
-            logger.warning("secrets_detected_in_memory_store", value_preview=value[:20])
-            raise SafetyViolationError(
-                "SECRETS_DETECTED: value appears to contain sensitive credentials"
-            )
+    if match := _SECRET_RE.search(value):
+        logger.warning(
+            "secrets_detected_in_memory_store", kind=match.lastgroup, value_preview=value[:20]
+        )
+        raise SafetyViolationError(
+            "SECRETS_DETECTED: value appears to contain sensitive credentials"
+        )
+
+
+# Repeat searches within a turn (e.g. tool-use retries) are served from memory
+_SEARCH_CACHE_TTL_S = 30.0
+_SEARCH_CACHE_MAX = 128
 
 
 def make_memory_search_handler(retriever: SemanticRetriever) -> Any:
+    # (query, top_k) -> (fetched_at, retriever generation, results)
+    cache: dict[tuple[str, int], tuple[float, int, list[dict[str, Any]]]] = {}
+
     async def memory_search(tool_input: dict[str, Any]) -> str:
         query = str(tool_input.get("query", "")).strip()
         top_k = int(tool_input.get("top_k", 3))
@@ -49,11 +64,28 @@ def make_memory_search_handler(retriever: SemanticRetriever) -> Any:
         if len(query) > 200:
             return "Error: query exceeds 200 characters"
 
-        try:
-            results = await retriever.search(query, top_k=top_k)
-        except Exception as e:
-            logger.warning("memory_search_failed", error=str(e))
-            return "No se encontraron memorias relevantes (ChromaDB no disponible)."
+        cache_key = (query, top_k)
+        hit = cache.get(cache_key)
+        now = time.monotonic()
+        if (
+            hit is not None
+            and now - hit[0] < _SEARCH_CACHE_TTL_S
+            and hit[1] == retriever.generation
+        ):
+            results = hit[2]
+        else:
+            try:
+                results = await retriever.search(query, top_k=top_k)
+            except Exception as e:
+                logger.warning("memory_search_failed", error=str(e))
+                return "No se encontraron memorias relevantes (ChromaDB no disponible)."
+            # search() returns [] rather than raising when ChromaDB is down or the query
+            # fails, so an empty result may be transient: only real hits are cached
+            if results:
+                cache.pop(cache_key, None)
+                if len(cache) >= _SEARCH_CACHE_MAX:
+                    del cache[next(iter(cache))]
+                cache[cache_key] = (now, retriever.generation, results)
 
         if not results:
             return "No se encontraron memorias relevantes para esa búsqueda."
@@ -101,62 +133,66 @@ def make_memory_store_handler(store: MemoryStore) -> Any:
     return memory_store
 
 
-MEMORY_SEARCH_DEFINITION = {
-    "name": "memory_search",
-    "description": (
-        "Search semantic memory for relevant past information. "
-        "Returns top matching memories based on semantic similarity. "
-        "Use this to recall previous conversations, user preferences, or stored facts."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "query": {
-                "type": "string",
-                "description": "What to search for (3-200 chars)",
-                "minLength": 3,
-                "maxLength": 200,
-            },
-            "top_k": {
-                "type": "integer",
-                "description": "Number of results to return (1-5). Default: 3.",
-                "default": 3,
-                "minimum": 1,
-                "maximum": 5,
+MEMORY_SEARCH_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "memory_search",
+        "description": (
+            "Search semantic memory for relevant past information. "
+            "Returns top matching memories based on semantic similarity. "
+            "Use this to recall previous conversations, user preferences, or stored facts."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "What to search for (3-200 chars)",
+                    "minLength": 3,
+                    "maxLength": 200,
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": "Number of results to return (1-5). Default: 3.",
+                    "default": 3,
+                    "minimum": 1,
+                    "maximum": 5,
+                },
             },
+            "required": ["query"],
         },
-        "required": ["query"],
-    },
-}
-
-MEMORY_STORE_DEFINITION = {
-    "name": "memory_store",
-    "description": (
-        "Store a fact or preference in long-term memory with a descriptive key. "
-        "Use this to remember user preferences, important information, or context. "
-        "Secrets and credentials are blocked."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "key": {
-                "type": "string",
-                "description": "Descriptive key for the memory (e.g., 'user_preferred_editor')",
-                "maxLength": 100,
-            },
-            "value": {
-                "type": "string",
-                "description": "The value to store",
-                "maxLength": 2000,
-            },
-            "confidence": {
-                "type": "number",
-                "description": "Confidence level (0.0-1.0). Default: 1.0",
-                "default": 1.0,
-                "minimum": 0.0,
-                "maximum": 1.0,
+    }
+)
+
+MEMORY_STORE_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "memory_store",
+        "description": (
+            "Store a fact or preference in long-term memory with a descriptive key. "
+            "Use this to remember user preferences, important information, or context. "
+            "Secrets and credentials are blocked."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "key": {
+                    "type": "string",
+                    "description": "Descriptive key for the memory (e.g., 'user_preferred_editor')",
+                    "maxLength": 100,
+                },
+                "value": {
+                    "type": "string",
+                    "description": "The value to store",
+                    "maxLength": 2000,
+                },
+                "confidence": {
+                    "type": "number",
+                    "description": "Confidence level (0.0-1.0). Default: 1.0",
+                    "default": 1.0,
+                    "minimum": 0.0,
+                    "maximum": 1.0,
+                },
             },
+            "required": ["key", "value"],
         },
-        "required": ["key", "value"],
-    },
-}
+    }
+)
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import functools
+import json
 import re
-from collections.abc import Awaitable, Callable
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Sequence
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -11,6 +15,7 @@ from typing import Any
 import structlog
 
 from emergent import SafetyViolationError, ToolExecutionError
+from emergent.tools.shell import MAX_COMMAND_LENGTH
 
 logger = structlog.get_logger(__name__)
 
@@ -26,7 +31,7 @@ class ExecutionContext(Enum):
     CRON_HEADLESS = "cron_headless"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolDefinition:
     name: str
     description: str
@@ -34,6 +39,9 @@ class ToolDefinition:
     handler: Callable[..., Awaitable[str]]
     safety_tier: SafetyTier
     timeout: int = 30
+    # Local read, no side effects: TIER_1 runs may be served from ToolRunCache until the next
+    # non-idempotent tool runs. Not for remote or time-varying data (web, system metrics)
+    idempotent: bool = False
 
 
 # ---------------------------------------------------------------------------
@@ -42,196 +50,284 @@ class ToolDefinition:
 
 # Ordered: check TIER_3 first (most restrictive), then TIER_1 allowlist, else TIER_2
 
-_TIER3_PATTERNS: list[re.Pattern[str]] = [
-    re.compile(r, re.IGNORECASE)
-    for r in [
-        # Destructive remove
-        r"rm\s+-[rf]*r[rf]*\s",
-        r"rm\s+--recursive",
-        # Privilege escalation
-        r"\bsudo\b",
-        r"\bsu\s+-",
-        r"\bdoas\b",
-        # Pipe to shell (code execution)
-        r"curl[^|]*\|[^|]*\b(bash|sh|zsh|fish|python|perl|ruby)\b",
-        r"wget[^|]*\|[^|]*\b(bash|sh|zsh|fish|python|perl|ruby)\b",
-        r"\|[^|]*\b(bash|sh|zsh|fish)\b\s*$",
-        # Subshell / command substitution with dangerous commands
-        r"\$\([^)]*\brm\b",
-        r"\$\([^)]*\bkill\b",
-        r"`[^`]*\brm\b",
-        # Semicolon/pipe chains with destructive commands
-        r"[;&|]\s*rm\s+",
-        r"[;&|]\s*sudo\b",
-        r"[;&|]\s*mkfs\b",
-        # Write to critical system paths
-        r">\s*/etc/",
-        r">\s*/dev/(sda|hda|nvme|sd[a-z])",
-        r">\s*/boot/",
-        r">>\s*/etc/passwd",
-        r">>\s*/etc/shadow",
-        r">>\s*/etc/sudoers",
-        # Fork bomb
-        r":\s*\(\s*\)\s*\{",
-        r"while\s+true\s*;\s*do\s+.*fork",
-        # Direct device/disk operations
-        r"\bdd\s+if=/dev/zero",
-        r"\bdd\s+if=/dev/urandom.*of=/dev/",
-        r"\bmkfs\b",
-        r"\bfdisk\b",
-        r"\bparted\b",
-        # Permissions on root or critical paths
-        r"chmod\s+[0-7]*[02467][0-7]*\s+/",
-        r"chmod\s+777\s+/(etc|bin|sbin|usr|boot)",
-        # Network exfiltration pipe
-        r"\bnc\s.*\|\s*(bash|sh)",
-        # Sensitive files (read/write)
-        r"\b(cat|cp|mv|echo)\s+.*/(\.ssh/id_rsa|\.ssh/id_ed25519|\.env)",
-        # Base64 decode pipe to shell
-        r"base64\s+-d[^|]*\|[^|]*\b(bash|sh)\b",
-        # Inline code execution (bypass all other patterns)
-        r"\bpython[23]?\s+-c\b",
-        r"\bperl\s+-e\b",
-        r"\bruby\s+-e\b",
-        r"\bnode\s+-e\b",
-        r"\beval\s+",
-        # Destructive find operations
-        r"\bfind\b.*\s-delete\b",
-        r"\bfind\b.*-exec\s+rm\b",
-        # Destructive via xargs
-        r"\bxargs\s+rm\b",
-        r"\bxargs\s+shred\b",
-        # System shutdown / reboot
-        r"\breboot\b",
-        r"\bshutdown\b",
-        r"\bpoweroff\b",
-        r"\bhalt\b",
-        r"\binit\s+0\b",
-        # Irrecoverable deletion
-        r"\bshred\b",
-        r"\btruncate\b",
-        # Crontab removal
-        r"\bcrontab\s+-r\b",
-        # Service disruption (stop/disable/mask)
-        r"\bsystemctl\s+(stop|disable|mask)\b",
-        # Write to critical paths via tee
-        r"\btee\s+/etc/",
-        r"\btee\s+/boot/",
-        r"\btee\s+-a\s+/etc/",
-        # Container escape via host mount
-        r"\bdocker\s+run\b.*-v\s+/:/",
-        # Ownership change on system paths
-        r"\bchown\b.*\s+/(etc|bin|sbin|usr|boot)",
-        # Filesystem mount operations
-        r"\bmount\b",
-        r"\bumount\b",
-        # Remote access / exfiltration
-        r"\bssh\b",
-        r"\bscp\b",
-        r"\brsync\b.*:",
-        # Anti-forensics
-        r"\bhistory\s+-c\b",
-        r"\bunset\s+HISTFILE\b",
-    ]
-]
+_TIER3_SOURCES: tuple[str, ...] = (
+    # Destructive remove
+    r"rm\s+-[rf]*r[rf]*\s",
+    r"rm\s+--recursive",
+    # Privilege escalation
+    r"\bsudo\b",
+    r"\bsu\s+-",
+    r"\bdoas\b",
+    # Pipe to shell (code execution)
+    r"curl[^|]*\|[^|]*\b(bash|sh|zsh|fish|python|perl|ruby)\b",
+    r"wget[^|]*\|[^|]*\b(bash|sh|zsh|fish|python|perl|ruby)\b",
+    r"\|[^|]*\b(bash|sh|zsh|fish)\b\s*$",
+    # Subshell / command substitution with dangerous commands
+    r"\$\([^)]*\brm\b",
+    r"\$\([^)]*\bkill\b",
+    r"`[^`]*\brm\b",
+    # Semicolon/pipe chains with destructive commands
+    r"[;&|]\s*rm\s+",
+    r"[;&|]\s*sudo\b",
+    r"[;&|]\s*mkfs\b",
+    # Write to critical system paths
+    r">\s*/etc/",
+    r">\s*/dev/(sda|hda|nvme|sd[a-z])",
+    r">\s*/boot/",
+    r">>\s*/etc/passwd",
+    r">>\s*/etc/shadow",
+    r">>\s*/etc/sudoers",
+    # Fork bomb
+    r":\s*\(\s*\)\s*\{",
+    # Direct device/disk operations
+    r"\bdd\s+if=/dev/zero",
+    r"\bmkfs\b",
+    r"\bfdisk\b",
+    r"\bparted\b",
+    # Permissions on root or critical paths
+    r"chmod\s+[0-7]*[02467][0-7]*\s+/",
+    r"chmod\s+777\s+/(etc|bin|sbin|usr|boot)",
+    # Base64 decode pipe to shell
+    r"base64\s+-d[^|]*\|[^|]*\b(bash|sh)\b",
+    # Inline code execution (bypass all other patterns)
+    r"\bpython[23]?\s+-c\b",
+    r"\bperl\s+-e\b",
+    r"\bruby\s+-e\b",
+    r"\bnode\s+-e\b",
+    r"\beval\s+",
+    # Destructive via xargs
+    r"\bxargs\s+rm\b",
+    r"\bxargs\s+shred\b",
+    # System shutdown / reboot
+    r"\breboot\b",
+    r"\bshutdown\b",
+    r"\bpoweroff\b",
+    r"\bhalt\b",
+    r"\binit\s+0\b",
+    # Irrecoverable deletion
+    r"\bshred\b",
+    r"\btruncate\b",
+    # Crontab removal
+    r"\bcrontab\s+-r\b",
+    # Service disruption (stop/disable/mask)
+    r"\bsystemctl\s+(stop|disable|mask)\b",
+    # Write to critical paths via tee
+    r"\btee\s+/etc/",
+    r"\btee\s+/boot/",
+    r"\btee\s+-a\s+/etc/",
+    # Filesystem mount operations
+    r"\bmount\b",
+    r"\bumount\b",
+    # Remote access / exfiltration
+    r"\bssh\b",
+    r"\bscp\b",
+    # Anti-forensics
+    r"\bhistory\s+-c\b",
+    r"\bunset\s+HISTFILE\b",
+)
+
+# TIER_3 patterns of the form <lead>.*<target>, kept as separate (lead, target) pairs.
+# As one regex, '.*' rescans to end of line from every lead occurrence (quadratic in
+# the command length); split, it is two linear searches: find the first lead, then
+# look for the target anywhere after it. Dropping '.*'s stop-at-newline makes the
+# split check match a superset of the combined regex, i.e. never less strict.
+_TIER3_SPLIT: tuple[tuple[str, str], ...] = (
+    # Fork bomb
+    (r"while\s+true\s*;\s*do\s", r"fork"),
+    # Direct device/disk operations
+    (r"\bdd\s+if=/dev/urandom", r"of=/dev/"),
+    # Network exfiltration pipe
+    (r"\bnc\s", r"\|\s*(bash|sh)"),
+    # Sensitive files (read/write)
+    (r"\b(cat|cp|mv|echo)\s", r"/(\.ssh/id_rsa|\.ssh/id_ed25519|\.env)"),
+    # Destructive find operations
+    (r"\bfind\b", r"\s-delete\b"),
+    (r"\bfind\b", r"-exec\s+rm\b"),
+    # Container escape via host mount
+    (r"\bdocker\s+run\b", r"-v\s+/:/"),
+    # Ownership change on system paths
+    (r"\bchown\b", r"\s+/(etc|bin|sbin|usr|boot)"),
+    # Remote access / exfiltration
+    (r"\brsync\b", r":"),
+)
 
 # TIER_1 allowlist — commands explicitly safe (read-only)
-_TIER1_PATTERNS: list[re.Pattern[str]] = [
-    re.compile(r, re.IGNORECASE)
-    for r in [
-        r"^ls(\s|$)",
-        r"^ls\s+(-[lha]+\s+)*[\w./~\s-]*$",
-        r"^cat\s+",
-        r"^head\s+",
-        r"^tail\s+",
-        r"^grep\s+",
-        r"^egrep\s+",
-        r"^find\s+",
-        r"^ps\s",
-        r"^ps$",
-        r"^pgrep\s+",
-        r"^top\s+-b",
-        r"^htop\s+-C",
-        r"^df\s",
-        r"^df$",
-        r"^du\s",
-        r"^free\s",
-        r"^free$",
-        r"^uptime$",
-        r"^uname\s",
-        r"^uname$",
-        r"^echo\s+",
-        r"^printf\s+",
-        r"^date$",
-        r"^date\s",
-        r"^whoami$",
-        r"^id$",
-        r"^pwd$",
-        r"^env$",
-        r"^printenv\s",
-        r"^which\s+",
-        r"^type\s+",
-        r"^wc\s+",
-        r"^sort\s+",
-        r"^uniq\s+",
-        r"^cut\s+",
-        r"^awk\s+",
-        r"^sed\s+-n\s+",  # sed read-only (-n without -i)
-        r"^diff\s+",
-        r"^git\s+(status|log|diff|show|branch|remote|fetch|stash\s+list)",
-        r"^docker\s+(ps|images|logs|inspect|stats|info|version)",
-        r"^docker-compose\s+(ps|logs)",
-        r"^systemctl\s+(status|list-units|is-active|is-enabled)",
-        r"^journalctl\s+",
-        r"^netstat\s+",
-        r"^ss\s+",
-        r"^ip\s+(addr|route|link)\s",
-        r"^ifconfig$",
-        r"^ping\s+",
-        r"^nslookup\s+",
-        r"^dig\s+",
-        r"^curl\s+-[^|]*$",  # curl without pipe
-        r"^wget\s+-q[^|]*$",  # wget without pipe
-        r"^python3?\s+-c\s+.*(print|import\s+sys)",
-        r"^pip\s+(list|show|freeze)",
-        r"^pip3\s+(list|show|freeze)",
-        r"^uv\s+(run|pip\s+list)",
-        r"^npm\s+(list|info|outdated)",
-        r"^node\s+--version",
-        r"^(python3?|pip3?|node|npm|git|docker)\s+--version",
-    ]
-]
+_TIER1_SOURCES: tuple[str, ...] = (
+    r"^ls(\s|$)",
+    # Flags, paths and whitespace only. Written without the (-[lha]+\s+)* group, whose
+    # characters the class already covers, and possessive, so a failing $ cannot backtrack
+    r"^ls\s[\w./~\s-]*+$",
+    r"^cat\s+",
+    r"^head\s+",
+    r"^tail\s+",
+    r"^grep\s+",
+    r"^egrep\s+",
+    r"^find\s+",
+    r"^ps\s",
+    r"^ps$",
+    r"^pgrep\s+",
+    r"^top\s+-b",
+    r"^htop\s+-C",
+    r"^df\s",
+    r"^df$",
+    r"^du\s",
+    r"^free\s",
+    r"^free$",
+    r"^uptime$",
+    r"^uname\s",
+    r"^uname$",
+    r"^echo\s+",
+    r"^printf\s+",
+    r"^date$",
+    r"^date\s",
+    r"^whoami$",
+    r"^id$",
+    r"^pwd$",
+    r"^env$",
+    r"^printenv\s",
+    r"^which\s+",
+    r"^type\s+",
+    r"^wc\s+",
+    r"^sort\s+",
+    r"^uniq\s+",
+    r"^cut\s+",
+    r"^awk\s+",
+    r"^sed\s+-n\s+",  # sed read-only (-n without -i)
+    r"^diff\s+",
+    r"^git\s+(status|log|diff|show|branch|remote|fetch|stash\s+list)",
+    r"^docker\s+(ps|images|logs|inspect|stats|info|version)",
+    r"^docker-compose\s+(ps|logs)",
+    r"^systemctl\s+(status|list-units|is-active|is-enabled)",
+    r"^journalctl\s+",
+    r"^netstat\s+",
+    r"^ss\s+",
+    r"^ip\s+(addr|route|link)\s",
+    r"^ifconfig$",
+    r"^ping\s+",
+    r"^nslookup\s+",
+    r"^dig\s+",
+    r"^curl\s+-[^|]*$",  # curl without pipe
+    r"^wget\s+-q[^|]*$",  # wget without pipe
+    r"^python3?\s+-c\s+.*(print|import\s+sys)",
+    r"^pip\s+(list|show|freeze)",
+    r"^pip3\s+(list|show|freeze)",
+    r"^uv\s+(run|pip\s+list)",
+    r"^npm\s+(list|info|outdated)",
+    r"^node\s+--version",
+    r"^(python3?|pip3?|node|npm|git|docker)\s+--version",
+)
 
 # Patterns that make any command TIER_2 (write but not destructive)
-_TIER2_SIGNALS: list[re.Pattern[str]] = [
-    re.compile(r, re.IGNORECASE)
-    for r in [
-        r"\bkill\b",
-        r"\bpkill\b",
-        r"\bkillall\b",
-        r"\brm\b",  # rm without -rf (would be TIER_3 above)
-        r"\bmv\b",
-        r"\bcp\b.*-[rf]",
-        r"\bmkdir\b",
-        r"\btouch\b",
-        r"\bchmod\b",
-        r"\bchown\b",
-        r"\bsystemctl\s+(start|stop|restart|enable|disable|reload)",
-        r"\bdocker\s+(start|stop|restart|rm|rmi|pull|run|exec)",
-        r"\bdocker-compose\s+(up|down|restart|stop|start)",
-        r"\bpip\s+install\b",
-        r"\bpip3\s+install\b",
-        r"\buv\s+add\b",
-        r"\bnpm\s+install\b",
-        r"\bapt(-get)?\s+(install|remove|purge|upgrade)\b",
-        r"\byum\s+(install|remove)\b",
-        r"\bsnap\s+(install|remove)\b",
-        r"\bgit\s+(commit|push|pull|checkout|reset|merge|rebase|tag)\b",
-        r"\bcrontab\b",
-        r"\bscreen\b",
-        r"\btmux\b",
-    ]
-]
+_TIER2_SOURCES: tuple[str, ...] = (
+    r"\bkill\b",
+    r"\bpkill\b",
+    r"\bkillall\b",
+    r"\brm\b",  # rm without -rf (would be TIER_3 above)
+    r"\bmv\b",
+    r"\bcp\b.*-[rf]",
+    r"\bmkdir\b",
+    r"\btouch\b",
+    r"\bchmod\b",
+    r"\bchown\b",
+    r"\bsystemctl\s+(start|stop|restart|enable|disable|reload)",
+    r"\bdocker\s+(start|stop|restart|rm|rmi|pull|run|exec)",
+    r"\bdocker-compose\s+(up|down|restart|stop|start)",
+    r"\bpip\s+install\b",
+    r"\bpip3\s+install\b",
+    r"\buv\s+add\b",
+    r"\bnpm\s+install\b",
+    r"\bapt(-get)?\s+(install|remove|purge|upgrade)\b",
+    r"\byum\s+(install|remove)\b",
+    r"\bsnap\s+(install|remove)\b",
+    r"\bgit\s+(commit|push|pull|checkout|reset|merge|rebase|tag)\b",
+    r"\bcrontab\b",
+    r"\bscreen\b",
+    r"\btmux\b",
+)
+
+
+def _fuse(sources: Sequence[str]) -> re.Pattern[str]:
+    """Compile patterns into one alternation; each branch is a named group p<index>."""
+    return re.compile("|".join(f"(?P<p{i}>{r})" for i, r in enumerate(sources)), re.IGNORECASE)
+
+
+# Compiled on first classification, not at import (~18ms): importing the tool package
+# should not pay for it when no shell command is ever classified.
+# One C-level search per tier instead of a Python loop over ~100 patterns
+@functools.cache
+def _tier3_re() -> re.Pattern[str]:
+    return _fuse(_TIER3_SOURCES)
+
+
+@functools.cache
+def _tier2_re() -> re.Pattern[str]:
+    return _fuse(_TIER2_SOURCES)
+
+
+@functools.cache
+def _tier3_split_re() -> tuple[tuple[re.Pattern[str], re.Pattern[str]], ...]:
+    return tuple(
+        (re.compile(lead, re.IGNORECASE), re.compile(target, re.IGNORECASE))
+        for lead, target in _TIER3_SPLIT
+    )
+
+
+def _split_tier3_match(cmd: str) -> str | None:
+    """Return the first _TIER3_SPLIT pattern (as lead.*target) that hits cmd, if any."""
+    for (lead, target), (lead_re, target_re) in zip(_TIER3_SPLIT, _tier3_split_re(), strict=True):
+        # The leftmost lead ends earliest, so it leaves the most room for the target
+        hit = lead_re.search(cmd)
+        if hit and target_re.search(cmd, hit.end()):
+            return f"{lead}.*{target}"
+    return None
+
+
+def _leading_commands(source: str) -> list[str]:
+    """Command names a ^-anchored TIER_1 pattern can start with, e.g. '^pip3?' → pip, pip3."""
+    if source.startswith("^("):
+        names = source[2 : source.index(")")].split("|")
+    else:
+        names = [re.match(r"\^([\w-]+\??)", source).group(1)]  # type: ignore[union-attr]
+    expanded: list[str] = []
+    for name in names:
+        # A trailing 'x?' makes the last character optional
+        expanded.extend([name[:-2], name[:-1]] if name.endswith("?") else [name])
+    return expanded
+
+
+def _index_by_command(sources: Sequence[str]) -> dict[str, re.Pattern[str]]:
+    """Group TIER_1 patterns by leading command name, one fused regex per name."""
+    grouped: dict[str, list[str]] = {}
+    for source in sources:
+        for name in _leading_commands(source):
+            grouped.setdefault(name, []).append(source)
+    return {name: _fuse(group) for name, group in grouped.items()}
+
+
+# Every TIER_1 pattern is ^<command> followed by whitespace or end of string, so the
+# command's first token selects the only patterns that can match: one dict lookup
+# plus one anchored match instead of trying ~60 alternatives
+@functools.cache
+def _tier1_by_command() -> dict[str, re.Pattern[str]]:
+    return _index_by_command(_TIER1_SOURCES)
+
+
+# Literal screens: every TIER_3 / TIER_2 pattern requires at least one of these
+# lowercase substrings, so a command containing none of them skips that tier's regex.
+# Keep these in sync when adding patterns (tests check each source has a literal).
+_TIER3_LITERALS = (
+    "rm", "su", "doas", "|", "$(", "`", "mkfs", ">", "{", "fork", "dd", "fdisk",
+    "parted", "chmod", ".ssh/id_", ".env", "base64", "python", "perl", "ruby", "node",
+    "eval", "find", "xargs", "reboot", "shutdown", "poweroff", "halt", "init", "shred",
+    "truncate", "crontab", "systemctl", "tee", "docker", "chown", "mount", "ssh", "scp",
+    "rsync", "history", "unset",
+)  # fmt: skip
+_TIER2_LITERALS = (
+    "kill", "rm", "mv", "cp", "mkdir", "touch", "chmod", "chown", "systemctl", "docker",
+    "pip", "uv", "npm", "apt", "yum", "snap", "git", "crontab", "screen", "tmux",
+)  # fmt: skip
+_TIER3_SCREEN = re.compile("|".join(map(re.escape, _TIER3_LITERALS)))
+_TIER2_SCREEN = re.compile("|".join(map(re.escape, _TIER2_LITERALS)))
 
 
 def classify_command(cmd: str) -> SafetyTier:
@@ -243,35 +339,108 @@ def classify_command(cmd: str) -> SafetyTier:
         2. Check TIER_1 allowlist — full match required
         3. Check TIER_2 signals — any match → TIER_2
         4. DEFAULT: TIER_2 (prefer over-blocking to under-blocking)
+
+    Commands longer than shell_execute accepts are blocked unscanned; this bounds the
+    regex work (a few patterns are quadratic in the command length).
     """
     cmd = cmd.strip()
+    if len(cmd) > MAX_COMMAND_LENGTH:
+        logger.warning("tier3_command_too_long", command_preview=cmd[:50], length=len(cmd))
+        return SafetyTier.TIER_3_BLOCKED
+    tier, pattern = _classify_stripped(cmd)
+    # Logged here, outside the cache, so every blocked attempt reaches the audit log
+    if pattern is not None:
+        logger.warning("tier3_pattern_matched", command_preview=cmd[:50], pattern=pattern)
+    return tier
+
+
+def classify_commands(cmds: Iterable[str]) -> list[SafetyTier]:
+    """Classify many commands at once (transcript or log scans), in input order."""
+    # Repeats are answered from _classify_stripped's cache. Commands are not joined into
+    # one buffer for a single search: split TIER_3 patterns like find.*-delete would
+    # match across the boundary between two harmless commands.
+    return [classify_command(cmd) for cmd in cmds]
+
+
+# Pure function of the command text; agents re-issue the same commands (ls, git status,
+# docker ps) constantly. Returns (tier, matched TIER_3 pattern or None); no logging here.
+@functools.lru_cache(maxsize=1024)
+def _classify_stripped(cmd: str) -> tuple[SafetyTier, str | None]:
     if not cmd:
-        return SafetyTier.TIER_2_CONFIRM
+        return SafetyTier.TIER_2_CONFIRM, None
 
-    # 1. TIER_3 check (most restrictive)
-    for pattern in _TIER3_PATTERNS:
-        if pattern.search(cmd):
-            logger.warning(
-                "tier3_pattern_matched", command_preview=cmd[:50], pattern=pattern.pattern
-            )
-            return SafetyTier.TIER_3_BLOCKED
+    # Screens run on the lowercased command; only for ASCII, where lower() agrees
+    # with IGNORECASE folding. Anything else always takes the full regex path.
+    lowered = cmd.lower() if cmd.isascii() else None
 
-    # 2. TIER_1 allowlist — check if any TIER_1 pattern matches start of command
-    for pattern in _TIER1_PATTERNS:
-        if pattern.match(cmd):
-            # Double-check: make sure no TIER_2 signal in the full command
-            has_tier2_signal = any(p.search(cmd) for p in _TIER2_SIGNALS)
-            if not has_tier2_signal:
-                return SafetyTier.TIER_1_AUTO
-            break
+    # 1. TIER_3 check (most restrictive)
+    pattern = None
+    if lowered is None or _TIER3_SCREEN.search(lowered):
+        match = _tier3_re().search(cmd)
+        # The outer named group closes last, so lastgroup names the branch that hit
+        pattern = (
+            _TIER3_SOURCES[int(match.lastgroup[1:])]  # type: ignore[index]
+            if match
+            else _split_tier3_match(cmd)
+        )
+    if pattern is not None:
+        return SafetyTier.TIER_3_BLOCKED, pattern
+
+    # 2. TIER_1 allowlist — match at start of command, with no TIER_2 signal anywhere
+    has_tier2_signal = (
+        lowered is None or _TIER2_SCREEN.search(lowered) is not None
+    ) and _tier2_re().search(cmd) is not None
+    if not has_tier2_signal:
+        tier1 = _tier1_by_command().get(cmd.split(None, 1)[0].lower())
+        if tier1 is not None and tier1.match(cmd):
+            return SafetyTier.TIER_1_AUTO, None
 
     # 3. TIER_2 signals
-    for pattern in _TIER2_SIGNALS:
-        if pattern.search(cmd):
-            return SafetyTier.TIER_2_CONFIRM
+    if has_tier2_signal:
+        return SafetyTier.TIER_2_CONFIRM, None
 
     # 4. Default: TIER_2 (safe default — prefer over-blocking)
-    return SafetyTier.TIER_2_CONFIRM
+    return SafetyTier.TIER_2_CONFIRM, None
+
+
+class ToolRunCache:
+    """LRU of recent idempotent tool results keyed by (tool name, canonical input).
+
+    Entries expire after ttl seconds, and the registry clears the whole cache whenever a
+    non-idempotent tool runs, so a read never outlives a write that may have changed it.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 30.0) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def key(tool_name: str, tool_input: dict[str, Any]) -> tuple[str, str] | None:
+        """Cache key for a call, or None if its input is not JSON-serializable."""
+        try:
+            return tool_name, json.dumps(tool_input, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key: tuple[str, str]) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self._ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: tuple[str, str], result: str) -> None:
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
 
 
 class ToolRegistry:
@@ -280,20 +449,25 @@ class ToolRegistry:
     def __init__(self, execution_context: ExecutionContext = ExecutionContext.USER_SESSION) -> None:
         self._tools: dict[str, ToolDefinition] = {}
         self._execution_context = execution_context
+        self._tool_defs: list[dict[str, Any]] | None = None
+        self._run_cache = ToolRunCache()
 
     def register(self, tool: ToolDefinition) -> None:
         self._tools[tool.name] = tool
+        self._tool_defs = None
 
     def get_tool_definitions(self) -> list[dict[str, Any]]:
-        """Return tool schemas for the Anthropic API."""
-        return [
-            {
-                "name": t.name,
-                "description": t.description,
-                "input_schema": t.input_schema,
-            }
-            for t in self._tools.values()
-        ]
+        """Return tool schemas for the Anthropic API (built once, rebuilt after register)."""
+        if self._tool_defs is None:
+            self._tool_defs = [
+                {
+                    "name": t.name,
+                    "description": t.description,
+                    "input_schema": t.input_schema,
+                }
+                for t in self._tools.values()
+            ]
+        return self._tool_defs
 
     def classify(self, tool_name: str, tool_input: dict[str, Any]) -> SafetyTier:
         """Classify a tool call into a safety tier."""
@@ -309,8 +483,8 @@ class ToolRegistry:
 
             # In headless context: TIER_2 → TIER_3 (block)
             if (
-                tier == SafetyTier.TIER_2_CONFIRM
-                and self._execution_context == ExecutionContext.CRON_HEADLESS
+                tier is SafetyTier.TIER_2_CONFIRM
+                and self._execution_context is ExecutionContext.CRON_HEADLESS
             ):
                 logger.warning(
                     "headless_tier2_blocked",
@@ -323,7 +497,7 @@ class ToolRegistry:
 
         # file_write / file_move / file_delete: TIER_2, blocked in headless
         if tool_name in ("file_write", "file_move", "file_delete"):
-            if self._execution_context == ExecutionContext.CRON_HEADLESS:
+            if self._execution_context is ExecutionContext.CRON_HEADLESS:
                 return SafetyTier.TIER_3_BLOCKED
             return SafetyTier.TIER_2_CONFIRM
 
@@ -332,22 +506,42 @@ class ToolRegistry:
             action = str(tool_input.get("action", ""))
             if action == "list":
                 return SafetyTier.TIER_1_AUTO
-            if self._execution_context == ExecutionContext.CRON_HEADLESS:
+            if self._execution_context is ExecutionContext.CRON_HEADLESS:
                 return SafetyTier.TIER_3_BLOCKED
             return SafetyTier.TIER_2_CONFIRM
 
         # All other tools use their registered default tier
         return tool.safety_tier
 
-    async def execute(self, tool_name: str, tool_input: dict[str, Any]) -> str:
-        """Execute a tool by name."""
+    async def execute(
+        self, tool_name: str, tool_input: dict[str, Any], tier: SafetyTier | None = None
+    ) -> str:
+        """Execute a tool by name. Pass tier when the caller has already classified the call."""
         tool = self._tools.get(tool_name)
         if tool is None:
             raise ToolExecutionError(f"Unknown tool: {tool_name}")
 
+        key = None
+        if tool.idempotent and tier is None:
+            tier = self.classify(tool_name, tool_input)
+        if tool.idempotent and tier is SafetyTier.TIER_1_AUTO:
+            key = self._run_cache.key(tool_name, tool_input)
+            if key is not None and (cached := self._run_cache.get(key)) is not None:
+                logger.debug("tool_cache_hit", tool_name=tool_name)
+                return cached
+
         try:
-            return await tool.handler(tool_input)
+            result = await tool.handler(tool_input)
         except SafetyViolationError:
             raise
         except Exception as e:
             raise ToolExecutionError(f"Tool '{tool_name}' failed: {e}") from e
+        finally:
+            # Anything with side effects may have changed what cached reads would return
+            if not tool.idempotent:
+                self._run_cache.clear()
+
+        # Failures (missing file, permission, ...) stay retryable instead of cached
+        if key is not None and not result.startswith("Error"):
+            self._run_cache.put(key, result)
+        return result
@@ -5,7 +5,11 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+import shlex
+import shutil
 import time
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 import structlog
@@ -19,8 +23,55 @@ MAX_OUTPUT_CHARS = 10_000
 MAX_STDERR_CHARS = 2_000
 
 
+# Anything the shell would expand, redirect, chain or comment out
+_SHELL_META = frozenset(";&|<>()$`\\*?[]{}~#!\n")
+
+
 def _hash_command(cmd: str) -> str:
-    return hashlib.sha256(cmd.encode()).hexdigest()[:16]
+    return hashlib.blake2b(cmd.encode(), digest_size=8).hexdigest()
+
+
+def _direct_argv(command: str) -> list[str] | None:
+    """argv to exec without /bin/sh when the shell would do nothing but split words."""
+    if not _SHELL_META.isdisjoint(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:  # unbalanced quotes: let the shell report it
+        return None
+    # Builtins, keywords and VAR=value prefixes are not on PATH
+    if not argv or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
+
+async def _read_capped(stream: asyncio.StreamReader, limit: int) -> tuple[bytes, bool]:
+    """Drain stream to EOF keeping only the first limit bytes; also report any overflow."""
+    kept = bytearray()
+    overflow = False
+    while chunk := await stream.read(65536):
+        room = limit - len(kept)
+        if room > 0:
+            kept += chunk[:room]
+        overflow = overflow or len(chunk) > room
+    return bytes(kept), overflow
+
+
+async def _communicate_capped(
+    proc: asyncio.subprocess.Process,
+) -> tuple[tuple[bytes, bool], tuple[bytes, bool]]:
+    """Like proc.communicate(), but output past the caps is read and dropped, not buffered.
+
+    The child still runs to completion. 4 bytes per char is the UTF-8 worst case, so the
+    kept bytes always decode to at least the char limit.
+    """
+    assert proc.stdout is not None and proc.stderr is not None
+    out, err = await asyncio.gather(
+        _read_capped(proc.stdout, MAX_OUTPUT_CHARS * 4),
+        _read_capped(proc.stderr, MAX_STDERR_CHARS * 4),
+    )
+    await proc.wait()
+    return out, err
 
 
 async def shell_execute(tool_input: dict[str, Any]) -> str:
@@ -42,13 +93,22 @@ async def shell_execute(tool_input: dict[str, Any]) -> str:
     start = time.monotonic()
     proc: asyncio.subprocess.Process | None = None
     try:
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout_bytes, stderr_bytes = await asyncio.wait_for(
-            proc.communicate(), timeout=timeout_seconds
+        argv = _direct_argv(command)
+        if argv is not None:
+            # Skips forking an intermediate /bin/sh
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        else:
+            proc = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        (stdout_bytes, stdout_overflow), (stderr_bytes, stderr_overflow) = await asyncio.wait_for(
+            _communicate_capped(proc), timeout=timeout_seconds
         )
     except TimeoutError:
         if proc is not None:
@@ -73,11 +133,11 @@ async def shell_execute(tool_input: dict[str, Any]) -> str:
     exit_code = proc.returncode or 0
 
     truncated = False
-    if len(stdout) > MAX_OUTPUT_CHARS:
+    if stdout_overflow or len(stdout) > MAX_OUTPUT_CHARS:
         stdout = stdout[:MAX_OUTPUT_CHARS] + "\n[... output truncated]"
         truncated = True
 
-    if len(stderr) > MAX_STDERR_CHARS:
+    if stderr_overflow or len(stderr) > MAX_STDERR_CHARS:
         stderr = stderr[:MAX_STDERR_CHARS] + "\n[... stderr truncated]"
 
     log.info(
@@ -89,14 +149,6 @@ async def shell_execute(tool_input: dict[str, Any]) -> str:
         duration_ms=duration_ms,
     )
 
-    result: dict[str, Any] = {
-        "stdout": stdout,
-        "stderr": stderr,
-        "exit_code": exit_code,
-        "duration_ms": duration_ms,
-        "truncated": truncated,
-    }
-
     # Format as readable text for Claude
     parts: list[str] = []
     if stdout:
@@ -111,31 +163,34 @@ async def shell_execute(tool_input: dict[str, Any]) -> str:
     return "\n".join(parts) if parts else "(no output)"
 
 
-TOOL_DEFINITION = {
-    "name": "shell_execute",
-    "description": (
-        "Execute a bash command on the host system and return stdout/stderr. "
-        "Read-only commands (ls, cat, ps, grep, df, docker ps, git status, etc.) "
-        "are executed automatically. "
-        "Write commands (kill, rm, mv, docker restart, pip install, etc.) require user confirmation. "
-        "Destructive commands (sudo, rm -rf, curl|bash) are always blocked. "
-        "Output is truncated at 10,000 chars. Timeout: 30s default, max 120s."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "command": {
-                "type": "string",
-                "description": "The bash command to execute. Max 500 chars.",
-                "maxLength": 500,
-            },
-            "timeout_seconds": {
-                "type": "integer",
-                "description": "Command timeout in seconds. Default 30, max 120.",
-                "default": 30,
-                "maximum": 120,
+TOOL_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "shell_execute",
+        "description": (
+            "Execute a bash command on the host system and return stdout/stderr. "
+            "Read-only commands (ls, cat, ps, grep, df, docker ps, git status, etc.) "
+            "are executed automatically. "
+            "Write commands (kill, rm, mv, docker restart, pip install, etc.) "
+            "require user confirmation. "
+            "Destructive commands (sudo, rm -rf, curl|bash) are always blocked. "
+            "Output is truncated at 10,000 chars. Timeout: 30s default, max 120s."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "The bash command to execute. Max 500 chars.",
+                    "maxLength": 500,
+                },
+                "timeout_seconds": {
+                    "type": "integer",
+                    "description": "Command timeout in seconds. Default 30, max 120.",
+                    "default": 30,
+                    "maximum": 120,
+                },
             },
+            "required": ["command"],
         },
-        "required": ["command"],
-    },
-}
+    }
+)
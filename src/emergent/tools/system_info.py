@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import time
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 import psutil
@@ -10,31 +14,55 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
-_CACHE: dict[str, Any] = {}
+# (timestamp, result) swapped in as one reference, so a reader never sees a torn entry
+_cache: tuple[float, str] | None = None
 _CACHE_TTL = 30  # seconds
+# Concurrent misses wait for the one snapshot in progress instead of each taking a sample
+_cache_lock = asyncio.Lock()
+
+
+def _cached() -> str | None:
+    if _cache is not None and time.monotonic() - _cache[0] < _CACHE_TTL:
+        return _cache[1]
+    return None
 
 
 async def system_info(tool_input: dict[str, Any]) -> str:
     """Return system metrics snapshot."""
-    now = time.monotonic()
+    global _cache
 
     # Cache with 30s TTL
-    if "data" in _CACHE and now - _CACHE.get("ts", 0) < _CACHE_TTL:
-        logger.debug("system_info_cache_hit")
-        return _CACHE["data"]
+    result = _cached()
+    if result is None:
+        async with _cache_lock:
+            # Re-check: another caller may have refreshed it while we waited
+            result = _cached()
+            if result is None:
+                now = time.monotonic()
+                result = await _collect()
+                _cache = (now, result)
+                return result
+    logger.debug("system_info_cache_hit")
+    return result
+
 
-    cpu_percent = psutil.cpu_percent(interval=0.5)
+async def _collect() -> str:
+    """Take a fresh metrics snapshot (~0.5s, for the CPU sample)."""
+    # Same 0.5s sample as cpu_percent(interval=0.5), without blocking the event loop
+    psutil.cpu_percent(interval=None)
+    await asyncio.sleep(0.5)
+    cpu_percent = psutil.cpu_percent(interval=None)
     ram = psutil.virtual_memory()
     disk = psutil.disk_usage("/")
     uptime_seconds = time.time() - psutil.boot_time()
 
     # Top 5 processes by CPU
     processes: list[dict[str, Any]] = []
-    for proc in sorted(
+    for proc in heapq.nlargest(
+        5,
         psutil.process_iter(["pid", "name", "cpu_percent", "memory_percent"]),
         key=lambda p: p.info.get("cpu_percent") or 0,
-        reverse=True,
-    )[:5]:
+    ):
         try:
             processes.append(
                 {
@@ -62,22 +90,22 @@ async def system_info(tool_input: dict[str, Any]) -> str:
         )
 
     result = "\n".join(result_lines)
-    _CACHE["data"] = result
-    _CACHE["ts"] = now
 
     logger.info("system_info_fetched", cpu_percent=cpu_percent, ram_pct=ram.percent)
     return result
 
 
-TOOL_DEFINITION = {
-    "name": "system_info",
-    "description": (
-        "Get a snapshot of system metrics: CPU usage, RAM, disk space, uptime, "
-        "and top processes by CPU. No arguments required. Results cached for 30s."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {},
-        "required": [],
-    },
-}
+TOOL_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "system_info",
+        "description": (
+            "Get a snapshot of system metrics: CPU usage, RAM, disk space, uptime, "
+            "and top processes by CPU. No arguments required. Results cached for 30s."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    }
+)
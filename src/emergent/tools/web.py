@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-import re
+import asyncio
+import functools
+import ipaddress
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 from urllib.parse import urlparse
 
@@ -16,26 +20,60 @@ logger = structlog.get_logger(__name__)
 MAX_CONTENT_CHARS = 10_000
 DEFAULT_TIMEOUT = 15
 
-# Private/loopback IP ranges — SSRF prevention
-_PRIVATE_IP_PATTERNS = [
-    re.compile(r)
-    for r in [
-        r"^127\.",
-        r"^10\.",
-        r"^192\.168\.",
-        r"^172\.(1[6-9]|2[0-9]|3[01])\.",
-        r"^169\.254\.",  # link-local
-        r"^::1$",  # IPv6 loopback
-        r"^fc00:",  # IPv6 unique local
-        r"^fe80:",  # IPv6 link-local
-    ]
-]
-
 _BLOCKED_HOSTNAMES = frozenset(["localhost", "127.0.0.1", "0.0.0.0", "::1"])
 
-
-def _check_ssrf(url: str) -> None:
-    """Block requests to private/loopback addresses."""
+# Module-level singleton: one connection pool shared by every fetch and retry, so
+# repeat requests to a host reuse the open TCP/TLS connection
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client. Call once at shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _is_blocked_ip(ip: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    """True for loopback, private, link-local and other non-public addresses."""
+    # ::ffff:127.0.0.1 and friends: judge the embedded IPv4 address
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return (
+        ip.is_private
+        or ip.is_loopback
+        or ip.is_link_local
+        or ip.is_reserved
+        or ip.is_multicast
+        or ip.is_unspecified
+    )
+
+
+# Keyed on the address string, never the hostname: a hostname is re-resolved on every
+# fetch, so a cached verdict cannot outlive a DNS change (rebinding)
+@functools.lru_cache(maxsize=256)
+def _address_verdict(address: str) -> bool | None:
+    """True if address is a blocked IP, False if a public one, None if not an IP literal."""
+    try:
+        return _is_blocked_ip(ipaddress.ip_address(address))
+    except ValueError:
+        return None
+
+
+async def _check_ssrf(url: str) -> None:
+    """Block requests to private/loopback addresses, including via DNS."""
     parsed = urlparse(url)
     host = parsed.hostname or ""
 
@@ -43,9 +81,20 @@ def _check_ssrf(url: str) -> None:
         logger.warning("ssrf_blocked", url=url, host=host)
         raise SafetyViolationError(f"SSRF_BLOCKED: '{host}' is a loopback/private address")
 
-    for pattern in _PRIVATE_IP_PATTERNS:
-        if pattern.match(host):
-            logger.warning("ssrf_blocked", url=url, host=host)
+    addresses = [host]
+    if _address_verdict(host) is None:
+        # Hostname: check every address it resolves to. Resolution failures are left
+        # for the HTTP client to report
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, parsed.port or 443)
+        except OSError:
+            return
+        addresses = [str(info[4][0]) for info in infos]
+
+    for address in addresses:
+        # Fail closed on anything that does not parse as an IP
+        if _address_verdict(address) is not False:
+            logger.warning("ssrf_blocked", url=url, host=host, address=address)
             raise SafetyViolationError(f"SSRF_BLOCKED: '{host}' is a private IP address")
 
 
@@ -65,7 +114,7 @@ async def web_fetch(tool_input: dict[str, Any]) -> str:
     if not url.startswith("https://"):
         return "Error: only https:// URLs are supported"
 
-    _check_ssrf(url)
+    await _check_ssrf(url)
 
     log = logger.bind(url=url)
     log.info("web_fetch_start")
@@ -80,18 +129,25 @@ async def web_fetch(tool_input: dict[str, Any]) -> str:
 
     while retries <= max_retries:
         try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, follow_redirects=True) as client:
-                response = await client.get(url, headers=headers)
+            async with get_client().stream("GET", url, headers=headers) as response:
+                if response.status_code >= 500 and retries < max_retries:
+                    retries += 1
+                    log.warning("web_fetch_5xx_retry", status=response.status_code, retry=retries)
+                    continue
+
+                if response.status_code >= 400:
+                    return f"Error: HTTP {response.status_code} from {url}"
+
+                # Stop reading once max_chars is guaranteed (<= 4 bytes per char); the
+                # rest of the body is never downloaded or decoded
+                byte_limit = max_chars * 4
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) > byte_limit:
+                        break
+                content = body.decode(response.encoding or "utf-8", errors="replace")
 
-            if response.status_code >= 500 and retries < max_retries:
-                retries += 1
-                log.warning("web_fetch_5xx_retry", status=response.status_code, retry=retries)
-                continue
-
-            if response.status_code >= 400:
-                return f"Error: HTTP {response.status_code} from {url}"
-
-            content = response.text
             truncated = False
             if len(content) > max_chars:
                 content = content[:max_chars] + "\n[... content truncated]"
@@ -117,27 +173,30 @@ async def web_fetch(tool_input: dict[str, Any]) -> str:
     return "Error: max retries exceeded"
 
 
-TOOL_DEFINITION = {
-    "name": "web_fetch",
-    "description": (
-        "Fetch content from a public HTTPS URL. Returns text content, truncated at 10,000 chars. "
-        "Timeout: 15s. Private/local IPs are blocked (SSRF prevention). "
-        "One retry on timeout or 5xx errors."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "url": {
-                "type": "string",
-                "description": "Public HTTPS URL to fetch",
-                "format": "uri",
-            },
-            "max_chars": {
-                "type": "integer",
-                "description": "Max characters to return. Default 10000.",
-                "default": 10000,
+TOOL_DEFINITION: Mapping[str, Any] = MappingProxyType(
+    {
+        "name": "web_fetch",
+        "description": (
+            "Fetch content from a public HTTPS URL. "
+            "Returns text content, truncated at 10,000 chars. "
+            "Timeout: 15s. Private/local IPs are blocked (SSRF prevention). "
+            "One retry on timeout or 5xx errors."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "Public HTTPS URL to fetch",
+                    "format": "uri",
+                },
+                "max_chars": {
+                    "type": "integer",
+                    "description": "Max characters to return. Default 10000.",
+                    "default": 10000,
+                },
             },
+            "required": ["url"],
         },
-        "required": ["url"],
-    },
-}
+    }
+)
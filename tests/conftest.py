@@ -11,11 +11,9 @@ from emergent.memory.store import MemoryStore
 
 
 @pytest.fixture
-def tmp_db(tmp_path: Path) -> MemoryStore:
-    """In-memory-style SQLite store using a temp file."""
-    db_path = tmp_path / "test.db"
-    store = MemoryStore(db_path)
-    return store
+def tmp_db() -> MemoryStore:
+    """In-memory SQLite store — private to the test, since a store keeps one connection."""
+    return MemoryStore(":memory:")
 
 
 @pytest.fixture
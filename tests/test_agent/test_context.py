@@ -0,0 +1,23 @@
+"""Tests for ContextBuilder — history budget."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+from emergent.agent.context import ContextBuilder
+from emergent.memory.store import MemoryStore
+
+
+class TestBuildContext:
+    async def test_oversized_recent_turn_keeps_history_floor(
+        self, tmp_db: MemoryStore, tmp_retriever
+    ):
+        tmp_retriever.get_relevant_memories_as_text = AsyncMock(return_value=None)
+        turns = [("user", f"msg {i}") for i in range(5)]
+        turns.append(("assistant", "x" * 100_000))  # ~25K tokens, past the whole budget
+        await tmp_db.save_conversation_turns("session1", turns)
+
+        builder = ContextBuilder(tmp_db, tmp_retriever)
+        _, _, _, history = await builder.build_context("session1", "next question")
+
+        assert [h["content"] for h in history] == ["msg 2", "msg 3", "msg 4", "x" * 100_000]
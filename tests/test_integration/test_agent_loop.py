@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import itertools
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import pytest_asyncio
 
 from emergent.agent.runtime import AgentRuntime
 from emergent.config import AgentConfig, EmergentSettings
@@ -20,55 +24,93 @@ def _make_settings() -> EmergentSettings:
     )
 
 
-def _make_text_response(text: str) -> MagicMock:
-    block = MagicMock()
-    block.type = "text"
-    block.text = text
+# Plain stand-ins for the SDK response types — the runtime only reads these attributes
 
-    response = MagicMock()
-    response.stop_reason = "end_turn"
-    response.content = [block]
-    response.usage = MagicMock(input_tokens=100, output_tokens=20)
-    return response
 
+@dataclass(slots=True, frozen=True)
+class FakeTextBlock:
+    text: str
+    type: str = "text"
 
-def _make_tool_then_text_response(
-    tool_name: str, tool_input: dict[str, Any], tool_id: str, final_text: str
-) -> tuple[MagicMock, MagicMock]:
-    tool_block = MagicMock()
-    tool_block.type = "tool_use"
-    tool_block.id = tool_id
-    tool_block.name = tool_name
-    tool_block.input = tool_input
 
-    tool_response = MagicMock()
-    tool_response.stop_reason = "tool_use"
-    tool_response.content = [tool_block]
-    tool_response.usage = MagicMock(input_tokens=200, output_tokens=30)
+@dataclass(slots=True, frozen=True)
+class FakeToolBlock:
+    id: str
+    name: str
+    input: dict[str, Any]
+    type: str = "tool_use"
 
-    text_response = _make_text_response(final_text)
-    return tool_response, text_response
 
+@dataclass(slots=True, frozen=True)
+class FakeUsage:
+    input_tokens: int
+    output_tokens: int
 
-@pytest.mark.asyncio
-async def test_simple_end_turn() -> None:
-    settings = _make_settings()
-    runtime = AgentRuntime(settings=settings)
-    try:
-        with patch.object(
-            runtime, "_call_with_retry", new=AsyncMock(return_value=_make_text_response("Hola!"))
-        ):
-            text, trace = await runtime.run(
-                user_message="Hola",
-                session_id="test-session",
-            )
 
-        assert text == "Hola!"
-        assert trace["success"] is True
-        assert trace["iterations"] == 1
-        assert trace["tools_called"] == []
-    finally:
-        await runtime.close()
+@dataclass(slots=True, frozen=True)
+class FakeResponse:
+    stop_reason: str
+    content: list[FakeTextBlock | FakeToolBlock]
+    usage: FakeUsage
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def runtime():
+    """One registry-less runtime for the module; tests patch its LLM call per test."""
+    shared = AgentRuntime(settings=_make_settings())
+    yield shared
+    await shared.close()
+
+
+@pytest_asyncio.fixture
+async def fresh_runtime():
+    """Per-test runtime for the real retry path, so rate gate and limiter state stay local."""
+    own = AgentRuntime(settings=_make_settings())
+    yield own
+    await own.close()
+
+
+def _seq(responses: Iterable[FakeResponse]) -> Callable[..., Awaitable[FakeResponse]]:
+    """Stand-in for _call_with_retry that returns the given responses in order."""
+    it = iter(responses)
+
+    async def _call(**kwargs: Any) -> FakeResponse:
+        return next(it)
+
+    return _call
+
+
+def _make_text_response(text: str) -> FakeResponse:
+    return FakeResponse(
+        stop_reason="end_turn",
+        content=[FakeTextBlock(text)],
+        usage=FakeUsage(input_tokens=100, output_tokens=20),
+    )
+
+
+def _make_tool_then_text_response(
+    tool_name: str, tool_input: dict[str, Any], tool_id: str, final_text: str
+) -> tuple[FakeResponse, FakeResponse]:
+    tool_response = FakeResponse(
+        stop_reason="tool_use",
+        content=[FakeToolBlock(id=tool_id, name=tool_name, input=tool_input)],
+        usage=FakeUsage(input_tokens=200, output_tokens=30),
+    )
+    return tool_response, _make_text_response(final_text)
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_simple_end_turn(runtime: AgentRuntime) -> None:
+    with patch.object(runtime, "_call_with_retry", new=_seq([_make_text_response("Hola!")])):
+        text, trace = await runtime.run(
+            user_message="Hola",
+            session_id="test-session",
+        )
+
+    assert text == "Hola!"
+    assert trace["success"] is True
+    assert trace["iterations"] == 1
+    assert trace["tools_called"] == []
 
 
 @pytest.mark.asyncio
@@ -100,9 +142,7 @@ async def test_tool_use_tier1_auto() -> None:
             final_text="El echo fue: echoed: hello",
         )
 
-        with patch.object(
-            runtime, "_call_with_retry", new=AsyncMock(side_effect=[tool_resp, text_resp])
-        ):
+        with patch.object(runtime, "_call_with_retry", new=_seq([tool_resp, text_resp])):
             text, trace = await runtime.run(
                 user_message="Hacé un echo de hello",
                 session_id="test-session",
@@ -149,9 +189,7 @@ async def test_tool_use_tier3_blocked() -> None:
             final_text="No puedo hacer eso.",
         )
 
-        with patch.object(
-            runtime, "_call_with_retry", new=AsyncMock(side_effect=[tool_resp, text_resp])
-        ):
+        with patch.object(runtime, "_call_with_retry", new=_seq([tool_resp, text_resp])):
             text, trace = await runtime.run(
                 user_message="Borrá todo",
                 session_id="test-session",
@@ -170,18 +208,13 @@ async def test_max_iterations_raises() -> None:
 
     runtime = AgentRuntime(settings=settings)
     try:
-        tool_block = MagicMock()
-        tool_block.type = "tool_use"
-        tool_block.id = "t1"
-        tool_block.name = "nonexistent"
-        tool_block.input = {}
-
-        loop_response = MagicMock()
-        loop_response.stop_reason = "tool_use"
-        loop_response.content = [tool_block]
-        loop_response.usage = MagicMock(input_tokens=50, output_tokens=10)
-
-        with patch.object(runtime, "_call_with_retry", new=AsyncMock(return_value=loop_response)):
+        loop_response = FakeResponse(
+            stop_reason="tool_use",
+            content=[FakeToolBlock(id="t1", name="nonexistent", input={})],
+            usage=FakeUsage(input_tokens=50, output_tokens=10),
+        )
+
+        with patch.object(runtime, "_call_with_retry", new=_seq(itertools.repeat(loop_response))):
             text, trace = await runtime.run(
                 user_message="Loop forever",
                 session_id="test-session",
@@ -194,95 +227,146 @@ async def test_max_iterations_raises() -> None:
         await runtime.close()
 
 
-@pytest.mark.asyncio
-async def test_history_is_passed_to_llm() -> None:
-    settings = _make_settings()
-    runtime = AgentRuntime(settings=settings)
-    try:
-        history = [
-            {"role": "user", "content": "Mensaje anterior"},
-            {"role": "assistant", "content": "Respuesta anterior"},
-        ]
+@pytest.mark.asyncio(loop_scope="module")
+async def test_history_is_passed_to_llm(runtime: AgentRuntime) -> None:
+    history = [
+        {"role": "user", "content": "Mensaje anterior"},
+        {"role": "assistant", "content": "Respuesta anterior"},
+    ]
 
-        captured_kwargs: dict[str, Any] = {}
+    captured_kwargs: dict[str, Any] = {}
 
-        async def _capture(**kwargs: Any) -> Any:
-            captured_kwargs.update(kwargs)
-            return _make_text_response("ok")
+    async def _capture(**kwargs: Any) -> Any:
+        captured_kwargs.update(kwargs)
+        return _make_text_response("ok")
 
-        with patch.object(runtime, "_call_with_retry", new=_capture):
-            await runtime.run(
-                user_message="Nuevo mensaje",
-                session_id="test-session",
-                history=history,
-            )
+    with patch.object(runtime, "_call_with_retry", new=_capture):
+        await runtime.run(
+            user_message="Nuevo mensaje",
+            session_id="test-session",
+            history=history,
+        )
 
-        messages = captured_kwargs["messages"]
-        assert messages[0]["content"] == "Mensaje anterior"
-        assert messages[1]["content"] == "Respuesta anterior"
-        assert messages[2]["content"] == "Nuevo mensaje"
-    finally:
-        await runtime.close()
+    messages = captured_kwargs["messages"]
+    assert messages[0]["content"] == "Mensaje anterior"
+    assert messages[1]["content"] == "Respuesta anterior"
+    assert messages[2]["content"] == "Nuevo mensaje"
 
 
 @pytest.mark.asyncio
-async def test_retry_on_rate_limit() -> None:
+async def test_retry_on_rate_limit(fresh_runtime: AgentRuntime, monkeypatch) -> None:
     import anthropic
+    from tenacity import wait_none
 
-    settings = _make_settings()
-    runtime = AgentRuntime(settings=settings)
-    try:
-        call_count = 0
-
-        async def _flaky(**kwargs: Any) -> Any:
-            nonlocal call_count
-            call_count += 1
-            if call_count < 3:
-                raise anthropic.RateLimitError(
-                    message="rate limited",
-                    response=MagicMock(status_code=429, headers={}),
-                    body={},
-                )
-            return _make_text_response("Finalmente!")
-
-        with patch.object(runtime._client.messages, "create", new=_flaky):
-            text, trace = await runtime.run(
-                user_message="Intentá",
-                session_id="test-session",
+    # No retry-after here, so the jittered backoff would really sleep for seconds
+    monkeypatch.setattr(AgentRuntime._call_with_retry.retry, "wait", wait_none())
+
+    call_count = 0
+
+    async def _flaky(**kwargs: Any) -> Any:
+        nonlocal call_count
+        call_count += 1
+        if call_count < 3:
+            raise anthropic.RateLimitError(
+                message="rate limited",
+                response=MagicMock(status_code=429, headers={}),
+                body={},
             )
+        return _make_text_response("Finalmente!")
 
-        assert text == "Finalmente!"
-        assert call_count == 3
-        assert trace["success"] is True
-    finally:
-        await runtime.close()
+    with patch.object(fresh_runtime._client.messages, "create", new=_flaky):
+        text, trace = await fresh_runtime.run(
+            user_message="Intentá",
+            session_id="test-session",
+        )
+
+    assert text == "Finalmente!"
+    assert call_count == 3
+    assert trace["success"] is True
 
 
 @pytest.mark.asyncio
-async def test_api_error_returns_graceful_message() -> None:
+async def test_retry_after_header_honoured(fresh_runtime: AgentRuntime) -> None:
+    import time
+
     import anthropic
 
-    settings = _make_settings()
-    runtime = AgentRuntime(settings=settings)
-    try:
+    call_count = 0
 
-        async def _fail(**kwargs: Any) -> Any:
-            raise anthropic.APIError(
-                message="server exploded",
-                request=MagicMock(),
+    async def _flaky(**kwargs: Any) -> Any:
+        nonlocal call_count
+        call_count += 1
+        if call_count < 3:
+            raise anthropic.RateLimitError(
+                message="rate limited",
+                response=MagicMock(status_code=429, headers={"retry-after": "0"}),
                 body={},
             )
+        return _make_text_response("ok")
 
-        with patch.object(runtime, "_call_with_retry", new=_fail):
-            text, trace = await runtime.run(
-                user_message="Algo",
-                session_id="test-session",
-            )
+    start = time.monotonic()
+    with patch.object(fresh_runtime._client.messages, "create", new=_flaky):
+        text, _ = await fresh_runtime.run(user_message="Intentá", session_id="test-session")
 
-        assert trace["success"] is False
-        assert "error" in text.lower() or "claude" in text.lower()
-    finally:
-        await runtime.close()
+    assert text == "ok"
+    assert call_count == 3
+    assert time.monotonic() - start < 1  # no jittered backoff on top of retry-after
+
+
+def test_retry_after_capped() -> None:
+    import anthropic
+
+    from emergent.agent.runtime import _RETRY_MAX_DELAY, _retry_after
+
+    error = anthropic.RateLimitError(
+        message="rate limited",
+        response=MagicMock(status_code=429, headers={"retry-after": "3600"}),
+        body={},
+    )
+    assert _retry_after(error) == _RETRY_MAX_DELAY
+
+
+@pytest.mark.asyncio
+async def test_bad_request_not_retried(fresh_runtime: AgentRuntime) -> None:
+    import anthropic
+
+    call_count = 0
+
+    async def _reject(**kwargs: Any) -> Any:
+        nonlocal call_count
+        call_count += 1
+        raise anthropic.BadRequestError(
+            message="bad request",
+            response=MagicMock(status_code=400, headers={}),
+            body={},
+        )
+
+    with patch.object(fresh_runtime._client.messages, "create", new=_reject):
+        _, trace = await fresh_runtime.run(user_message="Algo", session_id="test-session")
+
+    assert call_count == 1
+    assert trace["success"] is False
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_api_error_returns_graceful_message(runtime: AgentRuntime) -> None:
+    import anthropic
+
+    async def _fail(**kwargs: Any) -> Any:
+        raise anthropic.APIError(
+            message="server exploded",
+            request=MagicMock(),
+            body={},
+        )
+
+    with patch.object(runtime, "_call_with_retry", new=_fail):
+        text, trace = await runtime.run(
+            user_message="Algo",
+            session_id="test-session",
+        )
+
+    assert trace["success"] is False
+    assert "error" in text.lower() or "claude" in text.lower()
 
 
 @pytest.mark.asyncio
@@ -293,3 +377,68 @@ async def test_runtime_close_closes_http_client() -> None:
     await runtime.close()
 
     runtime._client.close.assert_awaited_once()  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_rate_gate_waits_for_window(monkeypatch) -> None:
+    import time
+
+    from emergent.agent.runtime import _RateGate
+
+    monkeypatch.setattr(_RateGate, "_WINDOW", 0.05)
+    gate = _RateGate(rpm_limit=1, tpm_limit=0)
+
+    start = time.monotonic()
+    await gate.acquire()
+    await gate.acquire()  # second request must wait for the first to leave the window
+    assert time.monotonic() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_rate_gate_honours_retry_after() -> None:
+    import time
+
+    from emergent.agent.runtime import _RateGate
+
+    gate = _RateGate(rpm_limit=0, tpm_limit=0)
+    gate.pause(0.05)
+
+    start = time.monotonic()
+    await gate.acquire()
+    assert time.monotonic() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_aimd_limiter_serializes_after_overload() -> None:
+    import asyncio
+
+    from emergent.agent.runtime import _AimdLimiter
+
+    limiter = _AimdLimiter(initial=2)
+    limiter.on_overload()  # 2 → 1
+
+    active = peak = 0
+
+    async def _call() -> None:
+        nonlocal active, peak
+        async with limiter.slot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(_call() for _ in range(3)))
+    assert peak == 1
+
+    limiter.on_success()  # 1 → 2
+    await asyncio.gather(*(_call() for _ in range(4)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_client_built_only_on_first_use() -> None:
+    runtime = AgentRuntime(settings=_make_settings())
+    assert "_client" not in vars(runtime)
+
+    await runtime.close()  # nothing to close, and must not build a client to close it
+    assert "_client" not in vars(runtime)
@@ -34,6 +34,65 @@ class TestMemoryStore:
         history = await tmp_db.get_recent_history("session1", max_turns=10)
         assert len(history) == 10
 
+    async def test_batch_save_keeps_order(self, tmp_db: MemoryStore):
+        turns = [("user" if i % 2 == 0 else "assistant", f"msg {i}") for i in range(30)]
+        ids = await tmp_db.save_conversation_turns("session1", turns)
+
+        history = await tmp_db.get_recent_history("session1", max_turns=10)
+        assert len(ids) == len(set(ids)) == 30
+        assert [(h["role"], h["content"]) for h in history] == turns[-10:]
+
+    async def test_history_cache_sees_later_writes(self, tmp_db: MemoryStore):
+        await tmp_db.save_conversation_turn("session1", "user", "first")
+        assert len(await tmp_db.get_recent_history("session1")) == 1  # warms the cache
+
+        await tmp_db.save_conversation_turns("session1", [("assistant", "second")])
+        history = await tmp_db.get_recent_history("session1", max_turns=1)
+        assert history == [{"role": "assistant", "content": "second"}]
+
+    async def test_history_beyond_cache_size_read_from_db(self, tmp_db: MemoryStore):
+        from emergent.memory.store import _HISTORY_CACHE_TURNS
+
+        turns = [("user", f"msg {i}") for i in range(_HISTORY_CACHE_TURNS + 10)]
+        await tmp_db.save_conversation_turns("session1", turns)
+        await tmp_db.get_recent_history("session1")
+
+        history = await tmp_db.get_recent_history("session1", max_turns=len(turns))
+        assert len(history) == len(turns)
+
+    async def test_histories_for_several_sessions(self, tmp_db: MemoryStore):
+        for i in range(5):
+            await tmp_db.save_conversation_turns("a", [("user", f"a{i}")])
+            await tmp_db.save_conversation_turns("b", [("user", f"b{i}")])
+        await tmp_db.get_recent_history("a")  # one warm session, one cold
+
+        histories = await tmp_db.get_recent_histories(["a", "b", "empty"], max_turns=2)
+        assert {sid: [h["content"] for h in hist] for sid, hist in histories.items()} == {
+            "a": ["a3", "a4"],
+            "b": ["b3", "b4"],
+            "empty": [],
+        }
+
+    async def test_history_trimmed_to_token_budget(self, tmp_db: MemoryStore):
+        turns = [("user", "x" * 400), ("assistant", "y" * 400), ("user", "z" * 40)]
+        await tmp_db.save_conversation_turns("session1", turns)
+
+        history = await tmp_db.get_recent_history("session1", max_tokens=150)
+        assert [h["content"][0] for h in history] == ["y", "z"]  # 100 + 10 tokens fit
+
+    async def test_short_turns_count_against_token_budget(self, tmp_db: MemoryStore):
+        await tmp_db.save_conversation_turns("session1", [("user", "ok")] * 5)
+
+        history = await tmp_db.get_recent_history("session1", max_tokens=3)
+        assert len(history) == 3  # each 2-char turn rounds up to one token
+
+    async def test_token_budget_keeps_min_turns(self, tmp_db: MemoryStore):
+        turns = [("user", "a"), ("user", "b"), ("assistant", "y" * 4000)]
+        await tmp_db.save_conversation_turns("session1", turns)
+
+        history = await tmp_db.get_recent_history("session1", max_tokens=100, min_turns=2)
+        assert [h["content"][0] for h in history] == ["b", "y"]  # floor kept over budget
+
     async def test_user_profile_set_and_get(self, tmp_db: MemoryStore):
         await tmp_db.set_profile_key("editor", "neovim", confidence=1.0)
         profile = await tmp_db.get_user_profile()
@@ -74,6 +133,22 @@ class TestMemoryStore:
             "error_message": None,
         }
         await tmp_db.save_trace(trace)
+        await tmp_db.flush_traces()
+
+        rows = await tmp_db._execute("SELECT id, total_tokens FROM traces")
+        assert [(r["id"], r["total_tokens"]) for r in rows] == [("test-trace-1", 150)]
+
+    async def test_close_writes_queued_traces(self, tmp_path):
+        db_path = tmp_path / "traces.db"
+        store1 = MemoryStore(db_path)
+        for i in range(100):
+            await store1.save_trace({"trace_id": f"t{i}", "session_id": "session1"})
+        await store1.close()
+
+        store2 = MemoryStore(db_path)
+        rows = await store2._execute("SELECT COUNT(*) AS n FROM traces")
+        assert rows[0]["n"] == 100
+        await store2.close()
 
     async def test_profile_as_text(self, tmp_db: MemoryStore):
         await tmp_db.set_profile_key("editor", "neovim")
@@ -84,6 +159,33 @@ class TestMemoryStore:
         assert "editor" in text
         assert "neovim" in text
 
+    async def test_profile_text_refreshed_after_write(self, tmp_db: MemoryStore):
+        await tmp_db.set_profile_key("editor", "neovim", confidence=0.6)
+        assert await tmp_db.get_profile_as_text() == "- editor: neovim"
+
+        await tmp_db.set_profile_key("editor", "helix", confidence=0.9)
+        assert await tmp_db.get_profile_as_text() == "- editor: helix"
+
+    async def test_profile_decay_visible_after_cached_read(self, tmp_db: MemoryStore):
+        await tmp_db.set_profile_key("editor", "neovim", confidence=0.52)
+        assert await tmp_db.get_user_profile() == {"editor": "neovim"}
+
+        await tmp_db._execute("UPDATE user_profile SET updated_at = datetime('now', '-60 days')")
+        await tmp_db.decay_profile_confidence()  # 0.52 → 0.47, below the 0.5 default
+
+        assert await tmp_db.get_user_profile() == {}
+
+    async def test_session_lookups_use_indexes(self, tmp_db: MemoryStore):
+        queries = [
+            "SELECT role, content FROM conversations "
+            "WHERE session_id = 's' ORDER BY rowid DESC LIMIT 20",
+            "SELECT summary FROM session_summaries WHERE session_id = 's' "
+            "ORDER BY generated_at DESC LIMIT 1",
+        ]
+        for sql in queries:
+            plan = " ".join(r["detail"] for r in await tmp_db._execute(f"EXPLAIN QUERY PLAN {sql}"))
+            assert "USING INDEX" in plan and "TEMP B-TREE" not in plan, plan
+
     async def test_persistence_across_instances(self, tmp_path):
         """Data should persist across MemoryStore instances (same db file)."""
         db_path = tmp_path / "persist_test.db"
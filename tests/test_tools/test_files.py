@@ -2,8 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+
 import pytest
 
+import emergent.tools.files as files_module
 from emergent import SafetyViolationError
 from emergent.tools.files import (
     directory_tree,
@@ -17,106 +24,117 @@ from emergent.tools.files import (
     search_in_files,
 )
 
+# One event loop for the whole run: these tests do trivial IO, so a fresh loop per test
+# would cost more than the test itself
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-class TestFileRead:
-    async def test_read_existing_file(self, tmp_path, monkeypatch):
-        # Create a test file in tmp_path and monkeypatch SANDBOX_ROOT
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("hello world")
-
-        result = await file_read({"path": "test.txt"})
-        assert "hello world" in result
-
-    async def test_file_not_found(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
 
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+def _populate(root: Path, names: Iterable[str], content: bytes = b"x") -> None:
+    """Create many small files with bare open/write/close, skipping pathlib's extra calls."""
+    for name in names:
+        fd = os.open(root / name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
 
-        result = await file_read({"path": "nonexistent.txt"})
-        assert "not found" in result.lower() or "FILE_NOT_FOUND" in result
 
-    async def test_path_traversal_blocked(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
+@pytest.fixture(scope="session")
+def link_sensitive_files(tmp_path_factory):
+    """Hard-link a .env and .ssh/id_rsa written once per session into a directory."""
+    template = tmp_path_factory.mktemp("sensitive")
+    (template / ".env").write_text("SECRET=value")
+    (template / ".ssh").mkdir()
+    (template / ".ssh" / "id_rsa").write_text("PRIVATE KEY")
 
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+    def _link(target: Path) -> None:
+        os.link(template / ".env", target / ".env")
+        (target / ".ssh").mkdir()
+        os.link(template / ".ssh" / "id_rsa", target / ".ssh" / "id_rsa")
 
-        with pytest.raises(SafetyViolationError, match="PATH_TRAVERSAL|OUTSIDE_SANDBOX"):
-            await file_read({"path": "../../etc/passwd"})
+    return _link
 
-    async def test_sensitive_env_blocked(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
 
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+@pytest.fixture(scope="class")
+def sandbox_root(tmp_path_factory):
+    """One sandbox directory per test class, emptied between its tests."""
+    return tmp_path_factory.mktemp("sandbox")
 
-        # Create a .env file
-        (tmp_path / ".env").write_text("SECRET=value")
 
-        with pytest.raises(SafetyViolationError, match="SENSITIVE_PATH"):
-            await file_read({"path": ".env"})
+@pytest.fixture(autouse=True)
+def sandbox(sandbox_root, monkeypatch, request):
+    """Confine every file tool to an empty sandbox_root."""
+    if request.node.get_closest_marker("no_sandbox_io") is None:
+        for entry in sandbox_root.iterdir():
+            if entry.is_dir() and not entry.is_symlink():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+    monkeypatch.setattr(files_module, "SANDBOX_ROOT", sandbox_root)
+    return sandbox_root
 
-    async def test_ssh_key_blocked(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
 
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        ssh_dir = tmp_path / ".ssh"
-        ssh_dir.mkdir()
-        (ssh_dir / "id_rsa").write_text("PRIVATE KEY")
-
-        with pytest.raises(SafetyViolationError, match="SENSITIVE_PATH"):
-            await file_read({"path": ".ssh/id_rsa"})
+class TestFileRead:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("test.txt", "hello world"),  # existing file
+            ("nonexistent.txt", "Error: FILE_NOT_FOUND:"),
+        ],
+    )
+    async def test_read(self, sandbox, path, expected):
+        (sandbox / "test.txt").write_text("hello world")
+
+        result = await file_read({"path": path})
+        assert expected in result
+
+    @pytest.mark.parametrize(
+        ("path", "match"),
+        [
+            ("../../etc/passwd", "PATH_TRAVERSAL|OUTSIDE_SANDBOX"),
+            (".env", "SENSITIVE_PATH"),
+            (".ssh/id_rsa", "SENSITIVE_PATH"),
+        ],
+    )
+    async def test_blocked(self, sandbox, link_sensitive_files, path, match):
+        link_sensitive_files(sandbox)
+
+        with pytest.raises(SafetyViolationError, match=match):
+            await file_read({"path": path})
+
+    async def test_max_chars_truncation(self, sandbox):
+        (sandbox / "big.txt").write_text("ñ" * 500)
+
+        result = await file_read({"path": "big.txt", "max_chars": 100})
+        assert result.startswith("ñ" * 100)
+        assert "ñ" * 101 not in result
+        assert "[... file truncated]" in result
 
 
 class TestFileWrite:
-    async def test_create_new_file(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        result = await file_write({"path": "new_file.txt", "content": "hello", "mode": "create"})
-        assert "created" in result.lower()
-        assert (tmp_path / "new_file.txt").read_text() == "hello"
-
-    async def test_create_fails_if_exists(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "existing.txt").write_text("old")
+    @pytest.mark.parametrize(
+        ("existing", "mode", "content", "message", "final"),
+        [
+            (None, "create", "hello", "created", "hello"),
+            ("old content", "overwrite", "new content", "overwritten", "new content"),
+            ("line1\n", "append", "line2\n", "appended", "line1\nline2\n"),
+        ],
+    )
+    async def test_write_modes(self, sandbox, existing, mode, content, message, final):
+        if existing is not None:
+            (sandbox / "file.txt").write_text(existing)
+
+        result = await file_write({"path": "file.txt", "content": content, "mode": mode})
+        assert result.startswith(f"File {message}: ")
+        assert (sandbox / "file.txt").read_text() == final
+
+    async def test_create_fails_if_exists(self, sandbox):
+        (sandbox / "existing.txt").write_text("old")
         result = await file_write({"path": "existing.txt", "content": "new", "mode": "create"})
-        assert "already exists" in result.lower()
-
-    async def test_overwrite_mode(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "file.txt").write_text("old content")
-        result = await file_write(
-            {"path": "file.txt", "content": "new content", "mode": "overwrite"}
-        )
-        assert "overwritten" in result.lower()
-        assert (tmp_path / "file.txt").read_text() == "new content"
-
-    async def test_append_mode(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "file.txt").write_text("line1\n")
-        result = await file_write({"path": "file.txt", "content": "line2\n", "mode": "append"})
-        assert "appended" in result.lower()
-        assert (tmp_path / "file.txt").read_text() == "line1\nline2\n"
-
-    async def test_path_traversal_blocked(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+        assert result == "Error: file already exists. Use mode='overwrite' to replace it."
 
+    @pytest.mark.no_sandbox_io
+    async def test_path_traversal_blocked(self):
         with pytest.raises(SafetyViolationError):
             await file_write({"path": "../../etc/evil.txt", "content": "evil"})
 
@@ -127,56 +145,37 @@ class TestFileWrite:
 
 
 class TestListDirectory:
-    async def test_list_files_and_dirs(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "subdir").mkdir()
-        (tmp_path / "file.txt").write_text("hello")
+    async def test_list_files_and_dirs(self, sandbox):
+        (sandbox / "subdir").mkdir()
+        (sandbox / "file.txt").write_text("hello")
 
         result = await list_directory({"path": "."})
         assert "[DIR]  subdir/" in result
         assert "[FILE] file.txt" in result
 
-    async def test_empty_directory(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        empty = tmp_path / "empty"
+    async def test_empty_directory(self, sandbox):
+        empty = sandbox / "empty"
         empty.mkdir()
 
         result = await list_directory({"path": "empty"})
-        assert "empty" in result.lower()
+        assert result == "Directory 'empty' is empty"
 
-    async def test_hidden_files_excluded_by_default(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / ".hidden").write_text("secret")
-        (tmp_path / "visible.txt").write_text("public")
+    async def test_hidden_files_excluded_by_default(self, sandbox):
+        (sandbox / ".hidden").write_text("secret")
+        (sandbox / "visible.txt").write_text("public")
 
         result = await list_directory({"path": "."})
         assert ".hidden" not in result
         assert "visible.txt" in result
 
-    async def test_hidden_files_shown_when_requested(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / ".hidden").write_text("secret")
+    async def test_hidden_files_shown_when_requested(self, sandbox):
+        (sandbox / ".hidden").write_text("secret")
 
         result = await list_directory({"path": ".", "show_hidden": True})
         assert ".hidden" in result
 
-    async def test_path_traversal_blocked(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
+    @pytest.mark.no_sandbox_io
+    async def test_path_traversal_blocked(self):
         with pytest.raises(SafetyViolationError):
             await list_directory({"path": "../../etc"})
 
@@ -187,27 +186,19 @@ class TestListDirectory:
 
 
 class TestDirectoryTree:
-    async def test_basic_tree(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "a").mkdir()
-        (tmp_path / "a" / "b.txt").write_text("content")
-        (tmp_path / "c.txt").write_text("content")
+    async def test_basic_tree(self, sandbox):
+        (sandbox / "a").mkdir()
+        (sandbox / "a" / "b.txt").write_text("content")
+        (sandbox / "c.txt").write_text("content")
 
         result = await directory_tree({"path": "."})
         assert "a/" in result
         assert "b.txt" in result
         assert "c.txt" in result
 
-    async def test_depth_limit(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
+    async def test_depth_limit(self, sandbox):
         # Create nested: a/b/c/d.txt
-        deep = tmp_path / "a" / "b" / "c"
+        deep = sandbox / "a" / "b" / "c"
         deep.mkdir(parents=True)
         (deep / "d.txt").write_text("deep")
 
@@ -216,14 +207,10 @@ class TestDirectoryTree:
         # b should not appear at depth 1 — a is at depth 1, b would be depth 2
         assert "b/" not in result
 
-    async def test_max_entries_truncation(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+    async def test_max_entries_truncation(self, sandbox, monkeypatch):
         monkeypatch.setattr(files_module, "_MAX_TREE_ENTRIES", 5)
 
-        for i in range(10):
-            (tmp_path / f"file_{i:02d}.txt").write_text("x")
+        _populate(sandbox, (f"file_{i:02d}.txt" for i in range(10)))
 
         result = await directory_tree({"path": "."})
         assert "truncated" in result
@@ -235,37 +222,47 @@ class TestDirectoryTree:
 
 
 class TestSearchFiles:
-    async def test_glob_matching(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "a.py").write_text("python")
-        (tmp_path / "b.txt").write_text("text")
+    async def test_glob_matching(self, sandbox):
+        (sandbox / "a.py").write_text("python")
+        (sandbox / "b.txt").write_text("text")
 
         result = await search_files({"path": ".", "pattern": "*.py"})
         assert "a.py" in result
         assert "b.txt" not in result
 
-    async def test_max_results(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        for i in range(10):
-            (tmp_path / f"file_{i}.txt").write_text("x")
+    async def test_max_results(self, sandbox):
+        _populate(sandbox, (f"file_{i}.txt" for i in range(4)))  # one more than the limit
 
         result = await search_files({"path": ".", "pattern": "*.txt", "max_results": 3})
         assert "3 result" in result
 
-    async def test_no_matches(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
+    async def test_no_matches(self):
+        result = await search_files({"path": ".", "pattern": "*.xyz"})
+        assert "No files matching" in result
 
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+    async def test_hidden_dirs_skipped(self, sandbox):
+        (sandbox / ".cache" / "deep").mkdir(parents=True)
+        (sandbox / ".cache" / "deep" / "hidden.py").write_text("x")
+        (sandbox / "src").mkdir()
+        (sandbox / "src" / "visible.py").write_text("x")
 
-        result = await search_files({"path": ".", "pattern": "*.xyz"})
+        result = await search_files({"path": ".", "pattern": "*.py"})
+        assert "src/visible.py" in result
+        assert "hidden.py" not in result
+
+    async def test_slash_pattern_matched_below_search_root(self, sandbox):
+        (sandbox / "p" / "sub").mkdir(parents=True)
+        (sandbox / "p" / "a.txt").write_text("x")
+        (sandbox / "p" / "sub" / "b.txt").write_text("x")
+
+        # 'p' is the search root itself, not a directory inside it
+        result = await search_files({"path": "p", "pattern": "p/*.txt"})
         assert "No files matching" in result
 
+        result = await search_files({"path": "p", "pattern": "sub/*.txt"})
+        assert "p/sub/b.txt" in result
+        assert "p/a.txt" not in result
+
 
 # ---------------------------------------------------------------------------
 # search_in_files
@@ -273,51 +270,65 @@ class TestSearchFiles:
 
 
 class TestSearchInFiles:
-    async def test_text_match(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "code.py").write_text("def hello():\n    return 'world'\n")
+    async def test_text_match(self, sandbox):
+        (sandbox / "code.py").write_text("def hello():\n    return 'world'\n")
 
         result = await search_in_files({"path": ".", "query": "hello"})
         assert "code.py:1:" in result
         assert "hello" in result
 
-    async def test_line_numbers(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "data.txt").write_text("aaa\nbbb\nccc\nbbb\n")
+    async def test_line_numbers(self, sandbox):
+        (sandbox / "data.txt").write_text("aaa\nbbb\nccc\nbbb\n")
 
         result = await search_in_files({"path": ".", "query": "bbb"})
         assert "data.txt:2:" in result
         assert "data.txt:4:" in result
 
-    async def test_binary_files_skipped(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
+    async def test_crlf_and_bare_cr_line_endings(self, sandbox):
+        (sandbox / "dos.txt").write_bytes(b"foo\r\nbar\rfoo\r\n")
 
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+        result = await search_in_files({"path": ".", "query": "foo$"})
+        assert "dos.txt:1: foo" in result
+        assert "dos.txt:3: foo" in result
+        assert "2 match" in result
 
-        (tmp_path / "binary.bin").write_bytes(b"\x00\x01\x02\x03hello")
-        (tmp_path / "text.txt").write_text("hello world")
+    async def test_binary_files_skipped(self, sandbox):
+        (sandbox / "binary.bin").write_bytes(b"\x00\x01\x02\x03hello")
+        (sandbox / "text.txt").write_text("hello world")
 
         result = await search_in_files({"path": ".", "query": "hello"})
         assert "text.txt" in result
         assert "binary.bin" not in result
 
-    async def test_max_results_clamped(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
+    async def test_named_pipe_skipped(self, sandbox):
+        os.mkfifo(sandbox / "pipe.txt")  # opening it for reading would block forever
+        (sandbox / "text.txt").write_text("hello world")
 
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+        result = await asyncio.wait_for(search_in_files({"path": ".", "query": "hello"}), 5)
+        assert "text.txt:1:" in result
+        assert "pipe.txt" not in result
 
-        # Create file with many matching lines
-        (tmp_path / "many.txt").write_text("match\n" * 100)
+    async def test_max_results_clamped(self, sandbox):
+        # One more matching line than the limit is enough to hit it
+        (sandbox / "many.txt").write_text("match\n" * 6)
 
         result = await search_in_files({"path": ".", "query": "match", "max_results": 5})
         assert "5 match" in result
 
+    async def test_matches_collected_across_scan_batches(self, sandbox):
+        _populate(sandbox, (f"f{i:02d}.txt" for i in range(40)), b"needle\n")
+
+        result = await search_in_files({"path": ".", "query": "needle", "max_results": 50})
+        assert "40 match" in result
+
+    async def test_invalid_regex_searched_literally(self, sandbox):
+        (sandbox / "calls.py").write_text("x = 1\nfoo(bar\n")
+        (sandbox / "other.py").write_text("foo = 2\n")
+
+        result = await search_in_files({"path": ".", "query": "foo("})
+        assert "calls.py:2:" in result
+        assert "other.py" not in result
+
 
 # ---------------------------------------------------------------------------
 # file_info
@@ -325,12 +336,8 @@ class TestSearchInFiles:
 
 
 class TestFileInfo:
-    async def test_file_metadata(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "test.txt").write_text("hello world")
+    async def test_file_metadata(self, sandbox):
+        (sandbox / "test.txt").write_text("hello world")
 
         result = await file_info({"path": "test.txt"})
         assert "Type: file" in result
@@ -338,21 +345,13 @@ class TestFileInfo:
         assert "Permissions:" in result
         assert "Modified:" in result
 
-    async def test_dir_metadata(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "subdir").mkdir()
+    async def test_dir_metadata(self, sandbox):
+        (sandbox / "subdir").mkdir()
 
         result = await file_info({"path": "subdir"})
         assert "Type: directory" in result
 
-    async def test_nonexistent(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
+    async def test_nonexistent(self):
         result = await file_info({"path": "nope.txt"})
         assert "does not exist" in result
 
@@ -363,46 +362,30 @@ class TestFileInfo:
 
 
 class TestFileMove:
-    async def test_move_file(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "old.txt").write_text("content")
+    async def test_move_file(self, sandbox):
+        (sandbox / "old.txt").write_text("content")
 
         result = await file_move({"source": "old.txt", "destination": "new.txt"})
         assert "Moved" in result
-        assert not (tmp_path / "old.txt").exists()
-        assert (tmp_path / "new.txt").read_text() == "content"
-
-    async def test_move_to_subdir(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+        assert not (sandbox / "old.txt").exists()
+        assert (sandbox / "new.txt").read_text() == "content"
 
-        (tmp_path / "file.txt").write_text("content")
+    async def test_move_to_subdir(self, sandbox):
+        (sandbox / "file.txt").write_text("content")
 
         result = await file_move({"source": "file.txt", "destination": "sub/file.txt"})
         assert "Moved" in result
-        assert (tmp_path / "sub" / "file.txt").exists()
+        assert (sandbox / "sub" / "file.txt").exists()
 
-    async def test_cross_sandbox_blocked(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "file.txt").write_text("content")
+    async def test_cross_sandbox_blocked(self, sandbox):
+        (sandbox / "file.txt").write_text("content")
 
         with pytest.raises(SafetyViolationError):
             await file_move({"source": "file.txt", "destination": "../../etc/evil.txt"})
 
-    async def test_destination_exists_error(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "a.txt").write_text("a")
-        (tmp_path / "b.txt").write_text("b")
+    async def test_destination_exists_error(self, sandbox):
+        (sandbox / "a.txt").write_text("a")
+        (sandbox / "b.txt").write_text("b")
 
         result = await file_move({"source": "a.txt", "destination": "b.txt"})
         assert "already exists" in result
@@ -414,35 +397,23 @@ class TestFileMove:
 
 
 class TestFileDelete:
-    async def test_delete_file(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "doomed.txt").write_text("bye")
+    async def test_delete_file(self, sandbox):
+        (sandbox / "doomed.txt").write_text("bye")
 
         result = await file_delete({"path": "doomed.txt"})
         assert "Deleted file" in result
-        assert not (tmp_path / "doomed.txt").exists()
-
-    async def test_non_recursive_dir_error(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+        assert not (sandbox / "doomed.txt").exists()
 
-        d = tmp_path / "notempty"
+    async def test_non_recursive_dir_error(self, sandbox):
+        d = sandbox / "notempty"
         d.mkdir()
         (d / "file.txt").write_text("x")
 
         result = await file_delete({"path": "notempty"})
-        assert "not empty" in result.lower()
-
-    async def test_recursive_dir(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
+        assert result.startswith("Error: directory ") and " is not empty. " in result
 
-        d = tmp_path / "deleteme"
+    async def test_recursive_dir(self, sandbox):
+        d = sandbox / "deleteme"
         d.mkdir()
         (d / "file.txt").write_text("x")
 
@@ -450,20 +421,28 @@ class TestFileDelete:
         assert "Deleted directory" in result
         assert not d.exists()
 
-    async def test_delete_empty_dir(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
-        (tmp_path / "emptydir").mkdir()
+    async def test_delete_empty_dir(self, sandbox):
+        (sandbox / "emptydir").mkdir()
 
         result = await file_delete({"path": "emptydir"})
         assert "Deleted directory" in result
 
-    async def test_protected_sandbox_root(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
-        monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
-
+    async def test_protected_sandbox_root(self):
         with pytest.raises(SafetyViolationError, match="PROTECTED_PATH"):
             await file_delete({"path": "."})
+
+    async def test_symlink_swap_after_delete_is_not_cached(self, tmp_path, monkeypatch):
+        home = tmp_path / "home"
+        outside = tmp_path / "outside"
+        (home / "shared").mkdir(parents=True)
+        outside.mkdir()
+        (home / "shared" / "notes.txt").write_text("inside")
+        (outside / "notes.txt").write_text("outside")
+        monkeypatch.setattr(files_module, "SANDBOX_ROOT", home)
+
+        assert "inside" in await file_read({"path": "shared/notes.txt"})
+        await file_delete({"path": "shared", "recursive": True})
+        (home / "shared").symlink_to(outside)
+
+        with pytest.raises(SafetyViolationError, match="OUTSIDE_SANDBOX"):
+            await file_read({"path": "shared/notes.txt"})
@@ -0,0 +1,61 @@
+"""Tests for memory tools."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+from emergent.tools.memory_tools import make_memory_search_handler
+
+_RESULTS = [{"content": "likes coffee", "relevance_score": 0.9}]
+
+
+class TestMemorySearchCache:
+    async def test_repeat_query_served_from_cache(self, tmp_retriever):
+        tmp_retriever.search = AsyncMock(return_value=_RESULTS)
+        handler = make_memory_search_handler(tmp_retriever)
+
+        first = await handler({"query": "coffee"})
+        second = await handler({"query": "coffee"})
+
+        assert first == second
+        assert "likes coffee" in first
+        tmp_retriever.search.assert_awaited_once()
+
+    async def test_different_top_k_is_a_separate_entry(self, tmp_retriever):
+        tmp_retriever.search = AsyncMock(return_value=_RESULTS)
+        handler = make_memory_search_handler(tmp_retriever)
+
+        await handler({"query": "coffee", "top_k": 2})
+        await handler({"query": "coffee", "top_k": 3})
+
+        assert tmp_retriever.search.await_count == 2
+
+    async def test_retriever_write_invalidates(self, tmp_retriever):
+        tmp_retriever.search = AsyncMock(return_value=_RESULTS)
+        handler = make_memory_search_handler(tmp_retriever)
+
+        await handler({"query": "coffee"})
+        tmp_retriever.generation += 1
+        await handler({"query": "coffee"})
+
+        assert tmp_retriever.search.await_count == 2
+
+    async def test_expired_entry_refetched(self, tmp_retriever, monkeypatch):
+        import emergent.tools.memory_tools as memory_tools_module
+
+        tmp_retriever.search = AsyncMock(return_value=_RESULTS)
+        handler = make_memory_search_handler(tmp_retriever)
+
+        await handler({"query": "coffee"})
+        monkeypatch.setattr(memory_tools_module, "_SEARCH_CACHE_TTL_S", 0.0)
+        await handler({"query": "coffee"})
+
+        assert tmp_retriever.search.await_count == 2
+
+    async def test_empty_result_not_cached(self, tmp_retriever):
+        # search() returns [] when ChromaDB is unavailable, so the next call must retry
+        tmp_retriever.search = AsyncMock(side_effect=[[], _RESULTS])
+        handler = make_memory_search_handler(tmp_retriever)
+
+        assert "No se encontraron" in await handler({"query": "coffee"})
+        assert "likes coffee" in await handler({"query": "coffee"})
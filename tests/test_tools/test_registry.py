@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
-from emergent.tools.registry import ExecutionContext, SafetyTier, ToolRegistry, classify_command
+from emergent.tools.registry import (
+    ExecutionContext,
+    SafetyTier,
+    ToolRegistry,
+    classify_command,
+    classify_commands,
+)
 
 # ---------------------------------------------------------------------------
 # TIER_1 tests — read-only commands that should auto-execute
@@ -83,6 +89,14 @@ class TestTier1Commands:
     def test_python_version(self):
         assert classify_command("python3 --version") == SafetyTier.TIER_1_AUTO
 
+    def test_whitespace_variants_share_cache_entry(self):
+        from emergent.tools.registry import _classify_stripped
+
+        classify_command("uname -a")
+        hits = _classify_stripped.cache_info().hits
+        assert classify_command("  uname -a\n") == SafetyTier.TIER_1_AUTO
+        assert _classify_stripped.cache_info().hits == hits + 1
+
 
 # ---------------------------------------------------------------------------
 # TIER_2 tests — write/execute commands that need confirmation
@@ -310,6 +324,65 @@ class TestTier3Commands:
     def test_unset_histfile(self):
         assert classify_command("unset HISTFILE") == SafetyTier.TIER_3_BLOCKED
 
+    # --- Sensitive files ---
+
+    def test_cat_ssh_key_after_chain(self):
+        assert classify_command("ls; cat ~/.ssh/id_rsa") == SafetyTier.TIER_3_BLOCKED
+
+    def test_cp_env_across_lines(self):
+        assert classify_command("cp \\\n  app/.env /tmp/x") == SafetyTier.TIER_3_BLOCKED
+
+    # --- Input bound ---
+
+    def test_repeated_block_logged_every_time(self, monkeypatch):
+        from unittest.mock import MagicMock
+
+        from emergent.tools import registry
+
+        log = MagicMock()
+        monkeypatch.setattr(registry, "logger", log)
+        for _ in range(3):  # second and third are cache hits
+            assert classify_command("sudo cat /etc/hosts") == SafetyTier.TIER_3_BLOCKED
+
+        assert [c.args[0] for c in log.warning.call_args_list] == ["tier3_pattern_matched"] * 3
+
+    def test_over_long_command_blocked_unscanned(self):
+        # Would take seconds to scan ('$(' with no closing paren is quadratic)
+        assert classify_command("$(x " * 8000) == SafetyTier.TIER_3_BLOCKED
+
+    # --- Literal screens ---
+
+    def test_every_pattern_has_a_screen_literal(self):
+        """A pattern without a screen literal would be silently skipped."""
+        import re
+
+        from emergent.tools import registry
+
+        for sources, literals in (
+            (
+                (*registry._TIER3_SOURCES, *(f"{a}.*{b}" for a, b in registry._TIER3_SPLIT)),
+                registry._TIER3_LITERALS,
+            ),
+            (registry._TIER2_SOURCES, registry._TIER2_LITERALS),
+        ):
+            for source in sources:
+                unescaped = re.sub(r"\\(.)", r"\1", source).lower()
+                assert any(lit in unescaped for lit in literals), source
+
+    def test_non_ascii_case_folding_still_blocked(self):
+        # U+017F (long s) folds to 's' under IGNORECASE but not under str.lower()
+        assert classify_command("ſudo ls") == SafetyTier.TIER_3_BLOCKED
+
+    def test_batch_classification_keeps_order_and_boundaries(self):
+        # Each command alone is read-only; joined into one buffer, find.*-delete would hit
+        cmds = ["find . -name '*.tmp'", "ls -delete", "rm notes.txt"]
+        assert classify_commands(cmds) == [
+            SafetyTier.TIER_1_AUTO,
+            SafetyTier.TIER_1_AUTO,
+            SafetyTier.TIER_2_CONFIRM,
+        ]
+        assert classify_commands(cmds) == [classify_command(c) for c in cmds]
+
 
 # ---------------------------------------------------------------------------
 # ExecutionContext tests
@@ -367,3 +440,120 @@ class TestExecutionContext:
         registry = ToolRegistry()
         tier = registry.classify("unknown_dangerous_tool", {})
         assert tier == SafetyTier.TIER_3_BLOCKED
+
+
+# ---------------------------------------------------------------------------
+# Tool definition schema tests
+# ---------------------------------------------------------------------------
+
+
+class TestToolDefinitions:
+    def test_definitions_refresh_after_register(self):
+        """Cached schema list is rebuilt when a new tool is registered."""
+        registry = ToolRegistry()
+
+        async def dummy_handler(x):
+            return ""
+
+        from emergent.tools.registry import ToolDefinition
+
+        assert registry.get_tool_definitions() == []
+
+        registry.register(
+            ToolDefinition(
+                name="echo",
+                description="test",
+                input_schema={},
+                handler=dummy_handler,
+                safety_tier=SafetyTier.TIER_1_AUTO,
+            )
+        )
+
+        defs = registry.get_tool_definitions()
+        assert [d["name"] for d in defs] == ["echo"]
+        assert registry.get_tool_definitions() is defs
+
+
+# ---------------------------------------------------------------------------
+# Tool result cache tests
+# ---------------------------------------------------------------------------
+
+
+class TestToolRunCache:
+    @staticmethod
+    def _registry(calls: list[str]) -> ToolRegistry:
+        from emergent.tools.registry import ToolDefinition
+
+        async def read_handler(tool_input):
+            calls.append("read")
+            if tool_input["path"] == "missing.txt":
+                return "Error: FILE_NOT_FOUND: 'missing.txt' does not exist"
+            return f"contents of {tool_input['path']}"
+
+        async def write_handler(tool_input):
+            calls.append("write")
+            return "ok"
+
+        registry = ToolRegistry()
+        registry.register(
+            ToolDefinition(
+                name="file_read",
+                description="test",
+                input_schema={},
+                handler=read_handler,
+                safety_tier=SafetyTier.TIER_1_AUTO,
+                idempotent=True,
+            )
+        )
+        registry.register(
+            ToolDefinition(
+                name="file_write",
+                description="test",
+                input_schema={},
+                handler=write_handler,
+                safety_tier=SafetyTier.TIER_2_CONFIRM,
+            )
+        )
+        return registry
+
+    async def test_repeated_idempotent_call_served_from_cache(self):
+        calls: list[str] = []
+        registry = self._registry(calls)
+
+        first = await registry.execute("file_read", {"path": "a.txt", "max_lines": 10})
+        second = await registry.execute("file_read", {"max_lines": 10, "path": "a.txt"})
+
+        assert first == second == "contents of a.txt"
+        assert calls == ["read"]
+
+    async def test_side_effecting_tool_invalidates_cache(self):
+        calls: list[str] = []
+        registry = self._registry(calls)
+
+        await registry.execute("file_read", {"path": "a.txt"})
+        await registry.execute("file_write", {"path": "a.txt", "content": "new"})
+        await registry.execute("file_read", {"path": "a.txt"})
+
+        assert calls == ["read", "write", "read"]
+
+    async def test_error_result_not_cached(self):
+        calls: list[str] = []
+        registry = self._registry(calls)
+
+        await registry.execute("file_read", {"path": "missing.txt"})
+        await registry.execute("file_read", {"path": "missing.txt"})
+
+        assert calls == ["read", "read"]
+
+    async def test_caller_tier_skips_reclassification(self, monkeypatch):
+        calls: list[str] = []
+        registry = self._registry(calls)
+
+        def _no_classify(*args):
+            raise AssertionError("tier was already known")
+
+        monkeypatch.setattr(registry, "classify", _no_classify)
+        await registry.execute("file_read", {"path": "a.txt"}, SafetyTier.TIER_1_AUTO)
+        await registry.execute("file_read", {"path": "a.txt"}, SafetyTier.TIER_1_AUTO)
+
+        assert calls == ["read"]
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import pytest
 
+import emergent.tools.files as files_module
 from emergent import SafetyViolationError
 from emergent.memory.store import MemoryStore
 from emergent.tools.files import file_read
@@ -76,15 +77,13 @@ class TestPrivilegeEscalation:
     def test_node_e_exfil(self):
         """node -e can exfiltrate data via HTTP."""
         assert (
-            classify_command("node -e 'require(\"fs\").readFileSync(\"/etc/passwd\")'")
+            classify_command('node -e \'require("fs").readFileSync("/etc/passwd")\'')
             == SafetyTier.TIER_3_BLOCKED
         )
 
 
 class TestDataLeakage:
     async def test_file_read_env_blocked(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
         monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
 
         (tmp_path / ".env").write_text("API_KEY=secret")
@@ -92,8 +91,6 @@ class TestDataLeakage:
             await file_read({"path": ".env"})
 
     async def test_file_read_ssh_id_rsa_blocked(self, tmp_path, monkeypatch):
-        import emergent.tools.files as files_module
-
         monkeypatch.setattr(files_module, "SANDBOX_ROOT", tmp_path)
 
         ssh_dir = tmp_path / ".ssh"
@@ -103,6 +100,35 @@ class TestDataLeakage:
         with pytest.raises(SafetyViolationError, match="SENSITIVE_PATH"):
             await file_read({"path": ".ssh/id_rsa"})
 
+    async def test_file_read_through_symlinked_parent_blocked(self, tmp_path, monkeypatch):
+        home = tmp_path / "home"
+        home.mkdir()
+        (tmp_path / "outside").mkdir()
+        (tmp_path / "outside" / "notes.txt").write_text("outside")
+        (home / "link").symlink_to(tmp_path / "outside")
+        monkeypatch.setattr(files_module, "SANDBOX_ROOT", home)
+
+        # The leaf is a regular file; only the parent component escapes
+        with pytest.raises(SafetyViolationError, match="OUTSIDE_SANDBOX"):
+            await file_read({"path": str(home / "link" / "notes.txt")})
+
+    async def test_file_read_after_external_symlink_swap_blocked(self, tmp_path, monkeypatch):
+        home = tmp_path / "home"
+        (home / "docs").mkdir(parents=True)
+        (home / "docs" / "notes.txt").write_text("inside")
+        (tmp_path / "outside").mkdir()
+        (tmp_path / "outside" / "notes.txt").write_text("outside")
+        monkeypatch.setattr(files_module, "SANDBOX_ROOT", home)
+        assert await file_read({"path": "docs/notes.txt"}) == "inside"
+
+        # Another process replaces the directory behind the agent's back
+        (home / "docs" / "notes.txt").unlink()
+        (home / "docs").rmdir()
+        (home / "docs").symlink_to(tmp_path / "outside")
+
+        with pytest.raises(SafetyViolationError, match="OUTSIDE_SANDBOX"):
+            await file_read({"path": "docs/notes.txt"})
+
     async def test_memory_store_anthropic_key_blocked(self, tmp_path):
         store = MemoryStore(tmp_path / "test.db")
         handler = make_memory_store_handler(store)
@@ -142,3 +168,54 @@ class TestDataLeakage:
     async def test_web_fetch_10_0_0_blocked(self):
         with pytest.raises(SafetyViolationError, match="SSRF_BLOCKED"):
             await web_fetch({"url": "https://10.0.0.1/internal"})
+
+    async def test_web_fetch_ipv4_mapped_ipv6_blocked(self):
+        with pytest.raises(SafetyViolationError, match="SSRF_BLOCKED"):
+            await web_fetch({"url": "https://[::ffff:127.0.0.1]/secret"})
+
+    async def test_web_fetch_hostname_resolving_to_private_blocked(self, monkeypatch):
+        import asyncio
+        import socket
+
+        async def _fake_getaddrinfo(self, host, port, *args, **kwargs):
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.1.2.3", port))]
+
+        monkeypatch.setattr(asyncio.get_running_loop().__class__, "getaddrinfo", _fake_getaddrinfo)
+        with pytest.raises(SafetyViolationError, match="SSRF_BLOCKED"):
+            await web_fetch({"url": "https://rebind.example.com/"})
+
+
+class TestCronGuards:
+    async def test_sub_minimum_interval_rejected(self):
+        from emergent.tools.cron import cron_schedule
+
+        result = await cron_schedule(
+            {"action": "create", "cron_expression": "* * * * *", "prompt": "check disk"}
+        )
+        assert "more often than every 5 minutes" in result
+
+    async def test_step_below_minimum_rejected(self):
+        from emergent.tools.cron import cron_schedule
+
+        result = await cron_schedule(
+            {"action": "create", "cron_expression": "*/2 * * * *", "prompt": "check disk"}
+        )
+        assert "more often than every 5 minutes" in result
+
+    @pytest.mark.parametrize(
+        ("minute_field", "violates"),
+        [
+            ("*/7", True),  # :56 → :00 is 4 minutes
+            ("3,*/10", True),  # :00 → :03
+            ("55-59/2", True),
+            ("0,58", True),  # :58 → :00 wraps into the next hour
+            ("*/5", False),
+            ("*/15", False),
+            ("0,30", False),
+            ("15", False),
+        ],
+    )
+    def test_minute_field_gaps(self, minute_field, violates):
+        from emergent.tools.cron import _violates_min_interval
+
+        assert _violates_min_interval(f"{minute_field} * * * *") is violates
@@ -27,7 +27,7 @@ class TestShellExecute:
 
     async def test_output_truncation(self):
         # Generate > 10K chars of output
-        result = await shell_execute({"command": "python3 -c \"print('x' * 20000)\""})
+        result = await shell_execute({"command": "head -c 20000 /dev/zero | tr '\\0' x"})
         assert "[... output truncated]" in result
         assert len(result) <= 10_100  # small buffer over the limit
 
@@ -54,7 +54,7 @@ class TestShellExecute:
 
         proc = DummyProc()
 
-        async def _fake_create_subprocess_shell(*args, **kwargs):
+        async def _fake_create_subprocess(*args, **kwargs):
             return proc
 
         async def _fake_wait_for(awaitable, timeout):
@@ -64,7 +64,12 @@ class TestShellExecute:
         monkeypatch.setattr(
             shell_module.asyncio,
             "create_subprocess_shell",
-            _fake_create_subprocess_shell,
+            _fake_create_subprocess,
+        )
+        monkeypatch.setattr(
+            shell_module.asyncio,
+            "create_subprocess_exec",
+            _fake_create_subprocess,
         )
         monkeypatch.setattr(shell_module.asyncio, "wait_for", _fake_wait_for)
 
@@ -85,3 +90,22 @@ class TestShellExecute:
         result = await shell_execute({"command": "printf 'line1\\nline2\\nline3'"})
         assert "line1" in result
         assert "line2" in result
+
+    async def test_simple_command_skips_shell(self, monkeypatch):
+        import emergent.tools.shell as shell_module
+
+        async def _no_shell(*args, **kwargs):
+            raise AssertionError("simple command should not go through /bin/sh")
+
+        monkeypatch.setattr(shell_module.asyncio, "create_subprocess_shell", _no_shell)
+        result = await shell_execute({"command": "echo 'two  spaces'"})
+        assert result == "two  spaces\n"
+
+    async def test_builtin_falls_back_to_shell(self):
+        # cd is not on PATH, so it must still run through /bin/sh
+        result = await shell_execute({"command": "cd /"})
+        assert result == "(no output)"
+
+    async def test_large_multibyte_output_capped(self):
+        result = await shell_execute({"command": "yes é | head -n 3000000 | tr -d '\\n'"})
+        assert result.startswith("é" * 10_000 + "\n[... output truncated]")
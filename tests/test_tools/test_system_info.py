@@ -0,0 +1,36 @@
+"""Tests for system_info tool."""
+
+from __future__ import annotations
+
+import asyncio
+
+import emergent.tools.system_info as system_info_module
+from emergent.tools.system_info import system_info
+
+
+class TestSystemInfoCache:
+    async def test_concurrent_misses_collect_once(self, monkeypatch):
+        calls = 0
+
+        async def _fake_collect() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "CPU: 1.0%"
+
+        monkeypatch.setattr(system_info_module, "_cache", None)
+        monkeypatch.setattr(system_info_module, "_collect", _fake_collect)
+
+        results = await asyncio.gather(*(system_info({}) for _ in range(10)))
+
+        assert results == ["CPU: 1.0%"] * 10
+        assert calls == 1
+
+    async def test_expired_entry_recollected(self, monkeypatch):
+        async def _fake_collect() -> str:
+            return "fresh"
+
+        monkeypatch.setattr(system_info_module, "_cache", (0.0, "stale"))
+        monkeypatch.setattr(system_info_module, "_collect", _fake_collect)
+
+        assert await system_info({}) == "fresh"
@@ -0,0 +1,44 @@
+"""Tests for web_fetch tool."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+import emergent.tools.web as web_module
+from emergent.tools.web import web_fetch
+
+# Public address literal: passes the SSRF check without a DNS lookup
+_URL = "https://93.184.216.34/page"
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route the shared client through a MockTransport answering with the given response."""
+
+    def _serve(handler):
+        monkeypatch.setattr(
+            web_module, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+    return _serve
+
+
+class TestWebFetch:
+    async def test_returns_body(self, serve):
+        serve(lambda request: httpx.Response(200, text="hello"))
+        assert await web_fetch({"url": _URL}) == "hello"
+
+    async def test_large_body_truncated(self, serve):
+        serve(lambda request: httpx.Response(200, text="é" * 50_000))
+        result = await web_fetch({"url": _URL, "max_chars": 100})
+        assert result == "é" * 100 + "\n[... content truncated]"
+
+    async def test_5xx_retried_once(self, serve):
+        statuses = iter([503, 200])
+        serve(lambda request: httpx.Response(next(statuses), text="recovered"))
+        assert await web_fetch({"url": _URL}) == "recovered"
+
+    async def test_4xx_reported(self, serve):
+        serve(lambda request: httpx.Response(404))
+        assert await web_fetch({"url": _URL}) == f"Error: HTTP 404 from {_URL}"